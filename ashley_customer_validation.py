@@ -16,7 +16,10 @@ Date: 2024
 import pandas as pd
 import numpy as np
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from datetime import datetime
 import json
 import os
 from typing import Dict, List, Tuple, Optional
@@ -27,9 +30,10 @@ import cv2
 import warnings
 warnings.filterwarnings('ignore')
 
+from utils import dump_report
+
 # 한글 폰트 설정
 import matplotlib.font_manager as fm
-import os
 
 # Windows 한글 폰트 경로 설정
 font_paths = [
@@ -39,40 +43,85 @@ font_paths = [
     'C:/Windows/Fonts/batang.ttc'
 ]
 
-# 사용 가능한 한글 폰트 찾기
-korean_font = None
-for font_path in font_paths:
-    if os.path.exists(font_path):
+@lru_cache(maxsize=1)
+def _find_korean_font() -> Optional[str]:
+    """사용 가능한 한글 폰트 이름 찾기 (프로세스당 한 번만 탐색)"""
+    for font_path in font_paths:
+        # 존재 여부를 따로 확인하지 않고 바로 읽어, 없거나 깨진 파일은 예외로 건너뜀
         try:
             font_prop = fm.FontProperties(fname=font_path)
             korean_font = font_prop.get_name()
-            print(f"한글 폰트 발견: {korean_font}")
-            break
-        except:
+        except (OSError, RuntimeError):
             continue
-
-if korean_font:
-    plt.rcParams['font.family'] = korean_font
-else:
-    # 폰트를 찾지 못한 경우 기본 설정
-    plt.rcParams['font.family'] = ['Malgun Gothic', 'Gulim', 'Dotum', 'Batang', 'DejaVu Sans']
+        print(f"한글 폰트 발견: {korean_font}")
+        return korean_font
+    
     print("한글 폰트를 찾을 수 없습니다. 기본 폰트를 사용합니다.")
+    return None
+
+def setup_korean_font():
+    """matplotlib 한글 폰트 설정 (탐색 결과는 캐시된 값을 재사용)"""
+    korean_font = _find_korean_font()
+    if korean_font:
+        plt.rcParams['font.family'] = korean_font
+    else:
+        # 폰트를 찾지 못한 경우 기본 설정
+        plt.rcParams['font.family'] = ['Malgun Gothic', 'Gulim', 'Dotum', 'Batang', 'DejaVu Sans']
+    plt.rcParams['axes.unicode_minus'] = False
 
-plt.rcParams['axes.unicode_minus'] = False
+setup_korean_font()
 
 class AshleyCustomerValidation:
     """애슐리 고객검증 시스템 클래스"""
     
+    # 반복 실행되는 INSERT 문은 클래스 상수로 두어 같은 문자열 객체를 재사용
+    _INSERT_VISIT_SQL = '''
+        INSERT INTO customer_visits 
+        (customer_id, visit_date, table_number, order_items, total_amount, satisfaction_score, visit_duration)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+    _INSERT_INGREDIENT_SQL = '''
+        INSERT INTO ingredient_inventory 
+        (ingredient_name, initial_quantity, current_quantity, unit, expiration_date, cost_per_unit)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    _INSERT_DISH_SQL = '''
+        INSERT INTO dish_analysis 
+        (customer_id, table_number, dish_name, analysis_result, waste_percentage, satisfaction_score)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    
     def __init__(self, db_path: str = "ashley_customer_validation.db"):
         self.db_path = db_path
         self.conn = None
+        self.rng = np.random.default_rng(42)
+        self._write_lock = threading.Lock()
+        # 쓰기 트랜잭션마다 증가하는 변경 번호 (조회 캐시 키로 사용해 쓰기 시 자동 무효화)
+        self._revision = 0
+        self._cached_query = lru_cache(maxsize=32)(self._query)
         self.setup_database()
         
     def setup_database(self):
         """데이터베이스 초기화"""
-        self.conn = sqlite3.connect(self.db_path)
-        cursor = self.conn.cursor()
+        # 트랜잭션은 _transaction()에서 직접 관리하고, 연결 하나를 여러 스레드(대시보드 콜백)가 공유
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
         
+        # WAL 저널 + NORMAL 동기화: 커밋마다 fsync하지 않고 읽기/쓰기가 서로 막지 않음
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+        """)
+        
+        with self._transaction() as cursor:
+            self._create_tables(cursor)
+        
+        print("✅ 데이터베이스 초기화 완료!")
+        
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """테이블 생성"""
         # 고객 방문 기록 테이블
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS customer_visits (
@@ -88,6 +137,12 @@ class AshleyCustomerValidation:
             )
         ''')
         
+        # 재방문율 조회용 인덱스 (기간 필터 + 고객별 집계를 인덱스만으로 처리)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_visits_date_customer
+            ON customer_visits (visit_date, customer_id)
+        ''')
+        
         # 재료 재고 테이블
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS ingredient_inventory (
@@ -117,15 +172,41 @@ class AshleyCustomerValidation:
             )
         ''')
         
-        self.conn.commit()
-        print("✅ 데이터베이스 초기화 완료!")
-        
-    def generate_sample_data(self):
-        """샘플 데이터 생성"""
+    def _drop_tables(self, cursor: sqlite3.Cursor):
+        """테이블 삭제 (인덱스와 AUTOINCREMENT 시퀀스도 함께 정리됨)"""
+        cursor.execute("DROP TABLE IF EXISTS customer_visits")
+        cursor.execute("DROP TABLE IF EXISTS ingredient_inventory")
+        cursor.execute("DROP TABLE IF EXISTS dish_analysis")
+        
+    @contextmanager
+    def _transaction(self):
+        """여러 쓰기 작업을 하나의 명시적 트랜잭션(BEGIN IMMEDIATE ... COMMIT)으로 묶음"""
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+            self._revision += 1
+        
+    def _query(self, revision: int, sql: str, params: Tuple = ()) -> Tuple:
+        """조회 결과를 튜플로 반환 (_cached_query로 감싸 같은 변경 번호 동안 재사용)"""
+        return tuple(self.conn.execute(sql, params))
+        
+    def _generate_customer_ids(self, n: int, rng: np.random.Generator) -> List[str]:
+        """고객 ID n개를 한 번에 생성 (CUST_1000 ~ CUST_9998)"""
+        numbers = rng.integers(1000, 9999, n)
+        return np.char.add('CUST_', numbers.astype('U4')).tolist()
+        
+    def generate_sample_data(self, replace: bool = False):
+        """샘플 데이터 생성 (replace=True면 기존 데이터를 지우고 새로 생성)"""
         print("📊 애슐리 샘플 데이터 생성 중...")
         
         # 고객 방문 데이터 생성
-        np.random.seed(42)
+        rng = self.rng
         visit_data = []
         
         # 메뉴 아이템들
@@ -133,105 +214,103 @@ class AshleyCustomerValidation:
             "스테이크", "파스타", "피자", "샐러드", "스프", "빵", "음료", "디저트"
         ]
         
-        for i in range(500):  # 500번의 방문 기록
-            customer_id = f"CUST_{np.random.randint(1000, 9999)}"
-            visit_date = datetime.now() - timedelta(days=np.random.randint(0, 90))
-            
+        n_visits = 500  # 500번의 방문 기록
+        
+        # 수치 컬럼은 한 번에 생성 (화면에는 소수 1자리만 표시되므로 float32/int16으로 충분)
+        table_numbers = rng.integers(1, 21, n_visits, dtype=np.int16)
+        total_amounts = rng.normal(45000, 15000, n_visits).astype(np.float32)
+        satisfaction_scores = rng.normal(4.2, 0.6, n_visits).astype(np.float32)
+        visit_durations = rng.integers(60, 180, n_visits, dtype=np.int16)  # 60-180분
+        customer_ids = self._generate_customer_ids(n_visits, rng)
+        
+        # 방문일은 오늘 날짜(datetime64[D])에서 최근 90일 이내 일수를 한 번에 빼서 생성
+        today = np.datetime64(datetime.now().date(), 'D')
+        visit_dates = (today - rng.integers(0, 90, n_visits)).astype(str).tolist()
+        
+        for customer_id, visit_date, table_number, total_amount, satisfaction_score, visit_duration in zip(
+                customer_ids, visit_dates, table_numbers.tolist(), total_amounts.tolist(),
+                satisfaction_scores.tolist(), visit_durations.tolist()):
             # 주문 아이템들 (1-4개)
-            num_items = np.random.randint(1, 5)
-            order_items = np.random.choice(menu_items, num_items, replace=False)
+            num_items = rng.integers(1, 5)
+            order_items = rng.choice(menu_items, num_items, replace=False)
             
             visit_data.append({
                 'customer_id': customer_id,
-                'visit_date': visit_date.strftime('%Y-%m-%d'),
-                'table_number': np.random.randint(1, 21),
+                'visit_date': visit_date,
+                'table_number': table_number,
                 'order_items': ','.join(order_items),
-                'total_amount': np.random.normal(45000, 15000),
-                'satisfaction_score': np.random.normal(4.2, 0.6),
-                'visit_duration': np.random.randint(60, 180)  # 60-180분
+                'total_amount': total_amount,
+                'satisfaction_score': satisfaction_score,
+                'visit_duration': visit_duration
             })
         
-        # 재료 재고 데이터 생성
-        ingredients = [
-            {"name": "소고기", "initial": 100, "unit": "kg", "cost": 15000},
-            {"name": "치킨", "initial": 80, "unit": "kg", "cost": 8000},
-            {"name": "파스타면", "initial": 50, "unit": "kg", "cost": 3000},
-            {"name": "토마토", "initial": 30, "unit": "kg", "cost": 4000},
-            {"name": "치즈", "initial": 25, "unit": "kg", "cost": 12000},
-            {"name": "빵", "initial": 40, "unit": "개", "cost": 2000},
-            {"name": "야채", "initial": 35, "unit": "kg", "cost": 5000},
-            {"name": "소스", "initial": 20, "unit": "L", "cost": 8000}
-        ]
+        # 재료 재고 데이터 생성 (레코드 목록 대신 컬럼별 배열로 관리)
+        ingredient_names = ["소고기", "치킨", "파스타면", "토마토", "치즈", "빵", "야채", "소스"]
+        initial_quantities = np.array([100, 80, 50, 30, 25, 40, 35, 20], dtype=np.float32)
+        units = ["kg", "kg", "kg", "kg", "kg", "개", "kg", "L"]
+        costs_per_unit = np.array([15000, 8000, 3000, 4000, 12000, 2000, 5000, 8000], dtype=np.float32)
+        n_ingredients = len(ingredient_names)
+        
+        # 현재 재고량 (초기량의 10-90%)
+        current_quantities = initial_quantities * rng.uniform(0.1, 0.9, n_ingredients).astype(np.float32)
+        expiration_dates = (today + rng.integers(1, 30, n_ingredients)).astype(str).tolist()
+        
+        ingredient_data = {
+            'ingredient_name': ingredient_names,
+            'initial_quantity': initial_quantities,
+            'current_quantity': current_quantities,
+            'unit': units,
+            'expiration_date': expiration_dates,
+            'cost_per_unit': costs_per_unit
+        }
         
-        ingredient_data = []
-        for ingredient in ingredients:
-            # 현재 재고량 (초기량의 10-90%)
-            current_qty = ingredient["initial"] * np.random.uniform(0.1, 0.9)
+        # 데이터베이스에 저장 (방문/재고 데이터를 한 트랜잭션으로)
+        with self._transaction() as cursor:
+            # 기존 데이터 교체 시 삭제/재생성도 같은 트랜잭션에서 처리해 빈 테이블이 노출되지 않게 함
+            if replace:
+                self._drop_tables(cursor)
+                self._create_tables(cursor)
             
-            ingredient_data.append({
-                'ingredient_name': ingredient["name"],
-                'initial_quantity': ingredient["initial"],
-                'current_quantity': current_qty,
-                'unit': ingredient["unit"],
-                'expiration_date': (datetime.now() + timedelta(days=np.random.randint(1, 30))).strftime('%Y-%m-%d'),
-                'cost_per_unit': ingredient["cost"]
-            })
+            # 고객 방문 데이터 삽입
+            cursor.executemany(self._INSERT_VISIT_SQL,
+                               ((data['customer_id'], data['visit_date'], data['table_number'],
+                                 data['order_items'], data['total_amount'], data['satisfaction_score'], data['visit_duration'])
+                                for data in visit_data))
+            
+            # 재료 재고 데이터 삽입
+            cursor.executemany(self._INSERT_INGREDIENT_SQL,
+                               zip(ingredient_data['ingredient_name'], ingredient_data['initial_quantity'].tolist(),
+                                   ingredient_data['current_quantity'].tolist(), ingredient_data['unit'],
+                                   ingredient_data['expiration_date'], ingredient_data['cost_per_unit'].tolist()))
         
-        # 데이터베이스에 저장
-        cursor = self.conn.cursor()
-        
-        # 고객 방문 데이터 삽입
-        for data in visit_data:
-            cursor.execute('''
-                INSERT INTO customer_visits 
-                (customer_id, visit_date, table_number, order_items, total_amount, satisfaction_score, visit_duration)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (data['customer_id'], data['visit_date'], data['table_number'], 
-                  data['order_items'], data['total_amount'], data['satisfaction_score'], data['visit_duration']))
-        
-        # 재료 재고 데이터 삽입
-        for data in ingredient_data:
-            cursor.execute('''
-                INSERT INTO ingredient_inventory 
-                (ingredient_name, initial_quantity, current_quantity, unit, expiration_date, cost_per_unit)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (data['ingredient_name'], data['initial_quantity'], data['current_quantity'], 
-                  data['unit'], data['expiration_date'], data['cost_per_unit']))
-        
-        self.conn.commit()
         print("✅ 샘플 데이터 생성 완료!")
         
     def calculate_revisit_rate(self, period_days: int = 30) -> Dict:
         """재방문율 계산"""
         print(f"\n🔄 최근 {period_days}일 재방문율 분석...")
         
-        cursor = self.conn.cursor()
-        
-        # 기간 설정
-        start_date = (datetime.now() - timedelta(days=period_days)).strftime('%Y-%m-%d')
-        
-        # 해당 기간 내 방문한 고객들
-        cursor.execute('''
-            SELECT customer_id, COUNT(*) as visit_count
-            FROM customer_visits 
-            WHERE visit_date >= ?
-            GROUP BY customer_id
-        ''', (start_date,))
+        # 해당 기간 내 방문 횟수별 고객 수 (기간 계산과 고객별 집계까지 SQLite에서 한 번에 처리)
+        # 기준일을 파라미터로 넘겨 캐시 키에 포함 (자정이 지나면 새 기간으로 다시 조회)
+        today = datetime.now().date().isoformat()
+        rows = self._cached_query(self._revision, '''
+            SELECT visit_count, COUNT(*) AS customer_count
+            FROM (
+                SELECT COUNT(*) AS visit_count
+                FROM customer_visits 
+                WHERE visit_date >= date(?, ?)
+                GROUP BY customer_id
+            )
+            GROUP BY visit_count
+        ''', (today, f'-{period_days} days'))
         
-        visit_counts = cursor.fetchall()
+        # 세부 분석
+        visit_frequency = dict(rows)
         
         # 재방문율 계산
-        total_customers = len(visit_counts)
-        repeat_customers = len([x for x in visit_counts if x[1] > 1])
+        total_customers = sum(visit_frequency.values())
+        repeat_customers = sum(n for count, n in visit_frequency.items() if count > 1)
         revisit_rate = (repeat_customers / total_customers * 100) if total_customers > 0 else 0
         
-        # 세부 분석
-        visit_frequency = {}
-        for customer_id, count in visit_counts:
-            if count not in visit_frequency:
-                visit_frequency[count] = 0
-            visit_frequency[count] += 1
-        
         result = {
             'total_customers': total_customers,
             'repeat_customers': repeat_customers,
@@ -251,39 +330,49 @@ class AshleyCustomerValidation:
         """재료 소진율 분석"""
         print("\n🥘 재료 소진율 분석...")
         
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        rows = self._cached_query(self._revision, '''
             SELECT ingredient_name, initial_quantity, current_quantity, unit, cost_per_unit
             FROM ingredient_inventory
         ''')
         
-        ingredients = cursor.fetchall()
-        
-        consumption_data = []
-        total_waste_cost = 0
-        
-        for ingredient in ingredients:
-            name, initial, current, unit, cost = ingredient
-            consumed = initial - current
-            consumption_rate = (consumed / initial * 100) if initial > 0 else 0
-            remaining_rate = (current / initial * 100) if initial > 0 else 0
-            
-            # 폐기 비용 계산 (남은 재료의 10%가 폐기된다고 가정)
-            waste_amount = current * 0.1
-            waste_cost = waste_amount * cost
-            
-            consumption_data.append({
+        # 조회 결과를 한 번 순회하며 컬럼별로 분리
+        names, units, quantities = [], [], []
+        for name, initial_qty, current_qty, unit, cost_per_unit in rows:
+            names.append(name)
+            units.append(unit)
+            quantities.append((initial_qty, current_qty, cost_per_unit))
+        
+        # 수치 컬럼을 배열로 모아 한 번에 계산
+        initial, current, cost = np.array(quantities, dtype=np.float64).reshape(-1, 3).T
+        
+        # 초기량이 0인 재료는 나눗셈 자체를 건너뛰고 0%로 둠 (0 나눗셈 경고/임시 배열 없음)
+        consumed = initial - current
+        has_initial = initial > 0
+        consumption_rates = np.divide(consumed, initial, out=np.zeros_like(initial), where=has_initial)
+        remaining_rates = np.divide(current, initial, out=np.zeros_like(initial), where=has_initial)
+        consumption_rates *= 100
+        remaining_rates *= 100
+        
+        # 폐기 비용 계산 (남은 재료의 10%가 폐기된다고 가정)
+        waste_costs = current * 0.1 * cost
+        total_waste_cost = float(waste_costs.sum())
+        
+        # 보고서/대시보드용 레코드는 마지막에 한 번만 구성
+        consumption_data = [
+            {
                 'ingredient': name,
-                'initial_quantity': initial,
-                'current_quantity': current,
-                'consumed_quantity': consumed,
+                'initial_quantity': initial_qty,
+                'current_quantity': current_qty,
+                'consumed_quantity': consumed_qty,
                 'consumption_rate': consumption_rate,
                 'remaining_rate': remaining_rate,
                 'unit': unit,
                 'waste_cost': waste_cost
-            })
-            
-            total_waste_cost += waste_cost
+            }
+            for name, initial_qty, current_qty, consumed_qty, consumption_rate, remaining_rate, unit, waste_cost
+            in zip(names, initial.tolist(), current.tolist(), consumed.tolist(),
+                   consumption_rates.tolist(), remaining_rates.tolist(), units, waste_costs.tolist())
+        ]
         
         # 위험 재료 식별 (소진율이 낮거나 높은 재료)
         low_consumption = [x for x in consumption_data if x['consumption_rate'] < 30]
@@ -294,7 +383,7 @@ class AshleyCustomerValidation:
             'low_consumption_ingredients': low_consumption,
             'high_consumption_ingredients': high_consumption,
             'total_waste_cost': total_waste_cost,
-            'average_consumption_rate': np.mean([x['consumption_rate'] for x in consumption_data])
+            'average_consumption_rate': float(np.mean(consumption_rates))
         }
         
         print(f"📊 재료 소진율 분석 결과:")
@@ -316,40 +405,38 @@ class AshleyCustomerValidation:
             # 여기에 실제 AI 분석 코드가 들어갑니다
             pass
         
-        # 시뮬레이션 데이터 생성
-        np.random.seed(42)
-        analysis_results = []
-        
+        # 시뮬레이션 데이터 생성 (호출마다 같은 결과가 나오도록 별도 시드 사용)
+        rng = np.random.default_rng(42)
         dishes = ["스테이크", "파스타", "피자", "샐러드"]
         
-        for i in range(20):  # 20개 접시 분석
-            dish = np.random.choice(dishes)
-            waste_percentage = np.random.normal(15, 8)  # 평균 15% 폐기
-            waste_percentage = max(0, min(100, waste_percentage))  # 0-100% 범위
-            
-            satisfaction = 5 - (waste_percentage / 20)  # 폐기율이 높을수록 만족도 낮음
-            satisfaction = max(1, min(5, satisfaction))
-            
-            analysis_results.append({
+        n_dishes = 20  # 20개 접시 분석
+        dish_names = rng.choice(dishes, n_dishes).tolist()
+        waste_percentages = np.clip(rng.normal(15, 8, n_dishes), 0, 100).astype(np.float32)  # 평균 15% 폐기, 0-100% 범위
+        satisfactions = np.clip(5 - waste_percentages / 20, 1, 5)  # 폐기율이 높을수록 만족도 낮음
+        table_numbers = rng.integers(1, 21, n_dishes, dtype=np.int16)
+        customer_ids = self._generate_customer_ids(n_dishes, rng)
+        analysis_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        analysis_results = [
+            {
                 'dish_name': dish,
                 'waste_percentage': waste_percentage,
                 'satisfaction_score': satisfaction,
-                'customer_id': f"CUST_{np.random.randint(1000, 9999)}",
-                'table_number': np.random.randint(1, 21),
-                'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            })
+                'customer_id': customer_id,
+                'table_number': table_number,
+                'analysis_date': analysis_date
+            }
+            for dish, waste_percentage, satisfaction, customer_id, table_number in zip(
+                dish_names, waste_percentages.tolist(), satisfactions.tolist(),
+                customer_ids, table_numbers.tolist())
+        ]
         
         # 분석 결과를 데이터베이스에 저장
-        cursor = self.conn.cursor()
-        for result in analysis_results:
-            cursor.execute('''
-                INSERT INTO dish_analysis 
-                (customer_id, table_number, dish_name, analysis_result, waste_percentage, satisfaction_score)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (result['customer_id'], result['table_number'], result['dish_name'], 
-                  json.dumps(result), result['waste_percentage'], result['satisfaction_score']))
-        
-        self.conn.commit()
+        with self._transaction() as cursor:
+            cursor.executemany(self._INSERT_DISH_SQL,
+                               ((result['customer_id'], result['table_number'], result['dish_name'],
+                                 json.dumps(result), result['waste_percentage'], result['satisfaction_score'])
+                                for result in analysis_results))
         
         # 통계 계산
         avg_waste = np.mean([r['waste_percentage'] for r in analysis_results])
@@ -400,76 +487,12 @@ class AshleyCustomerValidation:
         }
         
         # JSON 파일로 저장
-        with open('ashley_customer_validation_report.json', 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        dump_report(report, 'ashley_customer_validation_report.json')
         
         print("✅ 종합 보고서가 'ashley_customer_validation_report.json' 파일로 저장되었습니다!")
         
         return report
     
-    def create_visualizations(self):
-        """시각화 생성"""
-        print("\n📊 시각화 생성...")
-        
-        # 데이터 로드
-        revisit_data = self.calculate_revisit_rate()
-        consumption_data = self.analyze_ingredient_consumption()
-        ai_data = self.analyze_dish_waste_with_ai()
-        
-        # 스타일 설정
-        plt.style.use('default')
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        fig.suptitle('애슐리 고객검증 시스템 분석 결과', fontsize=16, fontweight='bold')
-        
-        # 한글 폰트 재설정
-        try:
-            # matplotlib 폰트 캐시 초기화
-            fm._rebuild()
-            plt.rcParams['font.family'] = korean_font if korean_font else 'Malgun Gothic'
-            plt.rcParams['font.size'] = 10
-            print(f"matplotlib 폰트 설정: {plt.rcParams['font.family']}")
-        except Exception as e:
-            print(f"폰트 설정 오류: {e}")
-            plt.rcParams['font.family'] = 'DejaVu Sans'
-        
-        # 1. 재방문율 분포
-        visit_freq = revisit_data['visit_frequency']
-        axes[0, 0].bar(visit_freq.keys(), visit_freq.values(), color='skyblue')
-        axes[0, 0].set_title('방문 빈도별 고객 수')
-        axes[0, 0].set_xlabel('방문 횟수')
-        axes[0, 0].set_ylabel('고객 수')
-        
-        # 2. 재료별 소진율
-        ingredients = [x['ingredient'] for x in consumption_data['consumption_data']]
-        consumption_rates = [x['consumption_rate'] for x in consumption_data['consumption_data']]
-        axes[0, 1].bar(ingredients, consumption_rates, color='lightcoral')
-        axes[0, 1].set_title('재료별 소진율')
-        axes[0, 1].set_ylabel('소진율 (%)')
-        axes[0, 1].tick_params(axis='x', rotation=45)
-        
-        # 3. 메뉴별 폐기율
-        if ai_data['dish_statistics']:
-            dishes = list(ai_data['dish_statistics'].keys())
-            waste_rates = [ai_data['dish_statistics'][dish]['avg_waste'] for dish in dishes]
-            axes[1, 0].bar(dishes, waste_rates, color='lightgreen')
-            axes[1, 0].set_title('메뉴별 평균 폐기율')
-            axes[1, 0].set_ylabel('폐기율 (%)')
-            axes[1, 0].tick_params(axis='x', rotation=45)
-        
-        # 4. 폐기율 vs 만족도 상관관계
-        waste_scores = [x['waste_percentage'] for x in ai_data['analysis_results']]
-        satisfaction_scores = [x['satisfaction_score'] for x in ai_data['analysis_results']]
-        axes[1, 1].scatter(waste_scores, satisfaction_scores, alpha=0.6, color='purple')
-        axes[1, 1].set_title('폐기율 vs 고객 만족도')
-        axes[1, 1].set_xlabel('폐기율 (%)')
-        axes[1, 1].set_ylabel('만족도 (5점 척도)')
-        
-        plt.tight_layout()
-        plt.savefig('ashley_customer_validation_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        
-        print("✅ 시각화가 'ashley_customer_validation_analysis.png' 파일로 저장되었습니다!")
-    
     def generate_recommendations(self, revisit_data: Dict, consumption_data: Dict, ai_data: Dict) -> List[str]:
         """개선 권장사항 생성"""
         recommendations = []
@@ -16,6 +16,7 @@ Date: 2024
 
 import dash
 from dash import dcc, html, Input, Output, dash_table, callback
+from dash.dash_table.Format import Format, Scheme
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -23,6 +24,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
+import threading
 from ashley_customer_validation import AshleyCustomerValidation
 
 # Plotly 한글 폰트 설정
@@ -32,11 +34,32 @@ pio.templates.default = "plotly_white"
 # 한글 폰트 설정을 위한 전역 변수
 KOREAN_FONT = "Malgun Gothic, AppleGothic, Gulim, Dotum, sans-serif"
 
+# 소진율 구간별 막대 색상 (30% 미만 / 70% 미만 / 70% 이상)
+CONSUMPTION_THRESHOLDS = np.array([30, 70])
+CONSUMPTION_COLORS = np.array(['#e74c3c', '#f39c12', '#27ae60'])
+
+# 데이터 테이블 수치 컬럼 표시 형식 (소수 1자리)
+ONE_DECIMAL = Format(precision=1, scheme=Scheme.fixed)
+
+# 카드/차트 칸에 반복해서 쓰는 스타일 (렌더링마다 같은 dict를 새로 만들지 않도록 모듈 상수로 공유)
+KPI_CARD_STYLE = {'textAlign': 'center', 'padding': '20px',
+                  'backgroundColor': 'white', 'borderRadius': '10px',
+                  'margin': '5px', 'flex': '1', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}
+STAT_CARD_STYLE = {'textAlign': 'center', 'padding': '15px',
+                   'backgroundColor': '#ecf0f1', 'borderRadius': '8px', 'margin': '5px', 'flex': '1'}
+CHART_CELL_STYLE = {'width': '50%', 'display': 'inline-block', 'padding': '10px'}
+
+# 대시보드는 새로고침마다 샘플 데이터를 교체하므로 공용 DB 파일 대신 전용 메모리 DB 사용
+DASHBOARD_DB_PATH = ":memory:"
+
 class AshleyDashboard:
     """애슐리 고객검증 대시보드 클래스"""
     
     def __init__(self):
         self.app = dash.Dash(__name__)
+        self.validator = AshleyCustomerValidation(DASHBOARD_DB_PATH)
+        # 새로고침(테이블 교체)과 분석 조회가 콜백 스레드 간에 섞이지 않도록 직렬화
+        self._refresh_lock = threading.Lock()
         self.setup_layout()
         self.setup_callbacks()
         
@@ -96,19 +119,17 @@ class AshleyDashboard:
         )
         def update_content(active_tab, n_clicks):
             try:
-                # 매번 새로운 validator 인스턴스 생성 (스레드 문제 해결)
-                validator = AshleyCustomerValidation()
+                # 데이터베이스 연결은 대시보드 수명 동안 재사용 (스레드 간 공유 가능)
+                validator = self.validator
                 
-                # 데이터 새로고침
-                validator.generate_sample_data()
-                
-                # 각 분석 실행
-                revisit_data = validator.calculate_revisit_rate()
-                consumption_data = validator.analyze_ingredient_consumption()
-                ai_data = validator.analyze_dish_waste_with_ai()
-                
-                # 연결 종료
-                validator.close_connection()
+                with self._refresh_lock:
+                    # 데이터 새로고침 (기존 데이터를 교체해 새로고침마다 DB가 계속 커지지 않게 함)
+                    validator.generate_sample_data(replace=True)
+                    
+                    # 각 분석 실행
+                    revisit_data = validator.calculate_revisit_rate()
+                    consumption_data = validator.analyze_ingredient_consumption()
+                    ai_data = validator.analyze_dish_waste_with_ai()
                 
                 # KPI 카드 생성
                 kpi_cards = self.create_kpi_cards(revisit_data, consumption_data, ai_data)
@@ -146,33 +167,25 @@ class AshleyDashboard:
                     html.H3(f"{revisit_data['revisit_rate']:.1f}%", 
                            style={'color': '#e74c3c', 'margin': 0, 'fontSize': 36}),
                     html.P("재방문율", style={'margin': 0, 'fontSize': 14})
-                ], style={'textAlign': 'center', 'padding': '20px', 
-                         'backgroundColor': 'white', 'borderRadius': '10px',
-                         'margin': '5px', 'flex': '1', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+                ], style=KPI_CARD_STYLE),
                 
                 html.Div([
                     html.H3(f"{consumption_data['average_consumption_rate']:.1f}%", 
                            style={'color': '#f39c12', 'margin': 0, 'fontSize': 36}),
                     html.P("평균 재료 소진율", style={'margin': 0, 'fontSize': 14})
-                ], style={'textAlign': 'center', 'padding': '20px', 
-                         'backgroundColor': 'white', 'borderRadius': '10px',
-                         'margin': '5px', 'flex': '1', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+                ], style=KPI_CARD_STYLE),
                 
                 html.Div([
                     html.H3(f"{ai_data['average_waste_percentage']:.1f}%", 
                            style={'color': '#e67e22', 'margin': 0, 'fontSize': 36}),
                     html.P("평균 접시 폐기율", style={'margin': 0, 'fontSize': 14})
-                ], style={'textAlign': 'center', 'padding': '20px', 
-                         'backgroundColor': 'white', 'borderRadius': '10px',
-                         'margin': '5px', 'flex': '1', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+                ], style=KPI_CARD_STYLE),
                 
                 html.Div([
                     html.H3(f"{ai_data['average_satisfaction']:.1f}/5.0", 
                            style={'color': '#27ae60', 'margin': 0, 'fontSize': 36}),
                     html.P("평균 고객 만족도", style={'margin': 0, 'fontSize': 14})
-                ], style={'textAlign': 'center', 'padding': '20px', 
-                         'backgroundColor': 'white', 'borderRadius': '10px',
-                         'margin': '5px', 'flex': '1', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'})
+                ], style=KPI_CARD_STYLE)
             ], style={'display': 'flex', 'marginBottom': 20})
         ])
         
@@ -191,7 +204,7 @@ class AshleyDashboard:
                         figure=self.create_revisit_chart(revisit_data),
                         style={'height': '400px'}
                     )
-                ], style={'width': '50%', 'display': 'inline-block', 'padding': '10px'}),
+                ], style=CHART_CELL_STYLE),
                 
                 # 재료 소진율 차트
                 html.Div([
@@ -199,7 +212,7 @@ class AshleyDashboard:
                         figure=self.create_consumption_chart(consumption_data),
                         style={'height': '400px'}
                     )
-                ], style={'width': '50%', 'display': 'inline-block', 'padding': '10px'})
+                ], style=CHART_CELL_STYLE)
             ]),
             
             html.Div([
@@ -209,7 +222,7 @@ class AshleyDashboard:
                         figure=self.create_ai_analysis_chart(ai_data),
                         style={'height': '400px'}
                     )
-                ], style={'width': '50%', 'display': 'inline-block', 'padding': '10px'}),
+                ], style=CHART_CELL_STYLE),
                 
                 # 만족도 vs 폐기율 상관관계
                 html.Div([
@@ -217,7 +230,7 @@ class AshleyDashboard:
                         figure=self.create_correlation_chart(ai_data),
                         style={'height': '400px'}
                     )
-                ], style={'width': '50%', 'display': 'inline-block', 'padding': '10px'})
+                ], style=CHART_CELL_STYLE)
             ])
         ])
     
@@ -232,22 +245,19 @@ class AshleyDashboard:
                     html.H4(f"{revisit_data['total_customers']}명", 
                            style={'color': '#3498db', 'margin': 0}),
                     html.P("총 고객 수", style={'margin': 0})
-                ], style={'textAlign': 'center', 'padding': '15px', 
-                         'backgroundColor': '#ecf0f1', 'borderRadius': '8px', 'margin': '5px', 'flex': '1'}),
+                ], style=STAT_CARD_STYLE),
                 
                 html.Div([
                     html.H4(f"{revisit_data['repeat_customers']}명", 
                            style={'color': '#e74c3c', 'margin': 0}),
                     html.P("재방문 고객", style={'margin': 0})
-                ], style={'textAlign': 'center', 'padding': '15px', 
-                         'backgroundColor': '#ecf0f1', 'borderRadius': '8px', 'margin': '5px', 'flex': '1'}),
+                ], style=STAT_CARD_STYLE),
                 
                 html.Div([
                     html.H4(f"{revisit_data['revisit_rate']:.1f}%", 
                            style={'color': '#27ae60', 'margin': 0}),
                     html.P("재방문율", style={'margin': 0})
-                ], style={'textAlign': 'center', 'padding': '15px', 
-                         'backgroundColor': '#ecf0f1', 'borderRadius': '8px', 'margin': '5px', 'flex': '1'})
+                ], style=STAT_CARD_STYLE)
             ], style={'display': 'flex', 'marginBottom': 20}),
             
             # 방문 빈도 차트
@@ -296,8 +306,14 @@ class AshleyDashboard:
             html.H4("📋 재료 재고 현황", style={'marginTop': 30, 'marginBottom': 15}),
             dash_table.DataTable(
                 data=consumption_data['consumption_data'],
-                columns=[{"name": i.replace('_', ' ').title(), "id": i} for i in 
-                        ['ingredient', 'initial_quantity', 'current_quantity', 'consumption_rate', 'unit']],
+                # 수치 컬럼은 서버에서 문자열로 바꾸지 않고 브라우저에서 소수 1자리로 표시
+                columns=[
+                    {"name": "Ingredient", "id": "ingredient"},
+                    {"name": "Initial Quantity", "id": "initial_quantity", "type": "numeric", "format": ONE_DECIMAL},
+                    {"name": "Current Quantity", "id": "current_quantity", "type": "numeric", "format": ONE_DECIMAL},
+                    {"name": "Consumption Rate", "id": "consumption_rate", "type": "numeric", "format": ONE_DECIMAL},
+                    {"name": "Unit", "id": "unit"}
+                ],
                 style_cell={'textAlign': 'left', 'padding': '10px'},
                 style_header={'backgroundColor': '#3498db', 'color': 'white', 'fontWeight': 'bold'},
                 style_data_conditional=[
@@ -327,22 +343,19 @@ class AshleyDashboard:
                     html.H4(f"{ai_data['total_dishes_analyzed']}개", 
                            style={'color': '#3498db', 'margin': 0}),
                     html.P("분석된 접시", style={'margin': 0})
-                ], style={'textAlign': 'center', 'padding': '15px', 
-                         'backgroundColor': '#ecf0f1', 'borderRadius': '8px', 'margin': '5px', 'flex': '1'}),
+                ], style=STAT_CARD_STYLE),
                 
                 html.Div([
                     html.H4(f"{ai_data['average_waste_percentage']:.1f}%", 
                            style={'color': '#e74c3c', 'margin': 0}),
                     html.P("평균 폐기율", style={'margin': 0})
-                ], style={'textAlign': 'center', 'padding': '15px', 
-                         'backgroundColor': '#ecf0f1', 'borderRadius': '8px', 'margin': '5px', 'flex': '1'}),
+                ], style=STAT_CARD_STYLE),
                 
                 html.Div([
                     html.H4(f"{ai_data['average_satisfaction']:.1f}/5.0", 
                            style={'color': '#27ae60', 'margin': 0}),
                     html.P("평균 만족도", style={'margin': 0})
-                ], style={'textAlign': 'center', 'padding': '15px', 
-                         'backgroundColor': '#ecf0f1', 'borderRadius': '8px', 'margin': '5px', 'flex': '1'})
+                ], style=STAT_CARD_STYLE)
             ], style={'display': 'flex', 'marginBottom': 20}),
             
             # 메뉴별 분석 차트
@@ -363,21 +376,22 @@ class AshleyDashboard:
         """트렌드 분석 탭 생성"""
         # 시뮬레이션 트렌드 데이터 생성
         dates = pd.date_range(start=datetime.now() - timedelta(days=30), end=datetime.now(), freq='D')
+        rng = np.random.default_rng(np.random.SFC64())
         
         # 재방문율 트렌드
-        revisit_trend = np.random.normal(45, 5, len(dates))
+        revisit_trend = rng.normal(45, 5, len(dates))
         revisit_trend = np.clip(revisit_trend, 30, 60)
         
         # 소진율 트렌드
-        consumption_trend = np.random.normal(65, 8, len(dates))
+        consumption_trend = rng.normal(65, 8, len(dates))
         consumption_trend = np.clip(consumption_trend, 40, 90)
         
         # 폐기율 트렌드
-        waste_trend = np.random.normal(15, 3, len(dates))
+        waste_trend = rng.normal(15, 3, len(dates))
         waste_trend = np.clip(waste_trend, 5, 25)
         
         # 만족도 트렌드
-        satisfaction_trend = np.random.normal(4.2, 0.3, len(dates))
+        satisfaction_trend = rng.normal(4.2, 0.3, len(dates))
         satisfaction_trend = np.clip(satisfaction_trend, 3.5, 5.0)
         
         # 트렌드 차트
@@ -512,10 +526,9 @@ class AshleyDashboard:
                     title="재료별 소진율",
                     labels={'x': '재료', 'y': '소진율 (%)'})
         
-        # 색상 설정 (소진율에 따라)
-        colors = ['#e74c3c' if rate < 30 else '#f39c12' if rate < 70 else '#27ae60' 
-                 for rate in consumption_rates]
-        fig.update_traces(marker_color=colors)
+        # 색상 설정 (소진율에 따라, 전체 배열을 한 번에 구간 조회)
+        colors = CONSUMPTION_COLORS[np.searchsorted(CONSUMPTION_THRESHOLDS, consumption_rates, side='right')]
+        fig.update_traces(marker_color=colors.tolist())
         fig.update_layout(font=dict(family=KOREAN_FONT))
         
         return fig
@@ -562,10 +575,15 @@ class AshleyDashboard:
                         labels={'x': '폐기율 (%)', 'y': '만족도 (5점 척도)'},
                         opacity=0.6)
         
-        # 상관관계 선 추가
-        z = np.polyfit(waste_scores, satisfaction_scores, 1)
-        p = np.poly1d(z)
-        fig.add_trace(go.Scatter(x=waste_scores, y=p(waste_scores), 
+        # 상관관계 선 추가 (최소제곱 직선을 편차 내적으로 직접 계산, 분산이 0이면 수평선)
+        x = np.asarray(waste_scores, dtype=np.float64)
+        y = np.asarray(satisfaction_scores, dtype=np.float64)
+        x_mean, y_mean = x.mean(), y.mean()
+        xm = x - x_mean
+        sxx = xm @ xm
+        slope = (xm @ (y - y_mean)) / sxx if sxx > 0 else 0.0
+        intercept = y_mean - slope * x_mean
+        fig.add_trace(go.Scatter(x=waste_scores, y=slope * x + intercept,
                                mode='lines', name='트렌드', line=dict(color='red', dash='dash')))
         
         fig.update_layout(font=dict(family=KOREAN_FONT))
@@ -9,18 +9,44 @@ Date: 2024
 """
 
 import dash
+import flask
 from dash import dcc, html, Input, Output, dash_table
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
 import pandas as pd
 import numpy as np
 from market_research_analyzer import MarketResearchAnalyzer
 
+class CachedLayoutDash(dash.Dash):
+    """정적 레이아웃을 한 번만 JSON으로 직렬화해 재사용하는 Dash 앱"""
+    
+    _layout_json = None
+    
+    def serve_layout(self):
+        """레이아웃 요청마다 컴포넌트 트리를 다시 직렬화하지 않고 캐시된 JSON 반환"""
+        # 함수형 레이아웃은 요청마다 달라질 수 있으므로 캐시하지 않음
+        if callable(self.layout):
+            return super().serve_layout()
+        
+        # 추가 컴포넌트와 레이아웃 훅까지 적용한 결과를 캐시
+        # (Dash 4는 get_layout(), Dash 2/3은 부모 serve_layout이 만든 flask 응답 본문 사용)
+        if self._layout_json is None:
+            if hasattr(self, 'get_layout'):
+                self._layout_json = to_json_plotly(self.get_layout())
+            else:
+                self._layout_json = super().serve_layout().get_data(as_text=True)
+        
+        if hasattr(self, 'backend'):
+            return self.backend.make_response(self._layout_json, mimetype="application/json")
+        return flask.Response(self._layout_json, mimetype="application/json")
+
+
 class DashboardApp:
     """시장조사 분석 대시보드 앱 클래스"""
     
     def __init__(self):
-        self.app = dash.Dash(__name__)
+        self.app = CachedLayoutDash(__name__)
         self.analyzer = MarketResearchAnalyzer()
         self.setup_layout()
         self.setup_callbacks()
@@ -86,13 +112,8 @@ class DashboardApp:
             if n_clicks == 0:
                 return html.Div("분석 실행 버튼을 클릭하여 데이터를 로드하세요."), ""
             
-            # 데이터 로드
-            self.analyzer.load_sample_data()
-            self.analyzer.analyze_customer_segments()
-            problems = self.analyzer.identify_problems()
-            insights = self.analyzer.generate_insights()
-            strategies = self.analyzer.create_strategy()
-            kpis = self.analyzer.set_kpis()
+            # 데이터 로드 및 분석
+            problems, insights, strategies, kpis = self._run_pipeline()
             
             if active_tab == "overview":
                 return self.create_overview_tab(), ""
@@ -107,13 +128,24 @@ class DashboardApp:
             elif active_tab == "kpi":
                 return self.create_kpi_tab(kpis), ""
     
+    def _run_pipeline(self):
+        """데이터 로드 후 분석 단계를 순서대로 실행 (서버 콘솔에 보고서를 출력하지 않음)"""
+        self.analyzer.load_sample_data(verbose=False)
+        self.analyzer.analyze_customer_segments(verbose=False)
+        problems = self.analyzer.identify_problems(verbose=False)
+        insights = self.analyzer.generate_insights(verbose=False)
+        strategies = self.analyzer.create_strategy(verbose=False)
+        kpis = self.analyzer.set_kpis(verbose=False)
+        return problems, insights, strategies, kpis
+    
     def create_overview_tab(self):
         """개요 탭 생성"""
         # 기본 통계
-        total_customers = len(self.analyzer.customer_data)
-        avg_satisfaction = self.analyzer.customer_data['satisfaction'].mean()
-        avg_purchase = self.analyzer.customer_data['purchase_amount'].mean()
-        avg_waiting = self.analyzer.customer_data['waiting_time'].mean()
+        customer_data = self.analyzer.customer_data
+        total_customers = len(customer_data)
+        avg_satisfaction, avg_purchase, avg_waiting = (
+            customer_data[['satisfaction', 'purchase_amount', 'waiting_time']].mean()
+        )
         
         return html.Div([
             html.H3("📊 기본 통계", style={'marginBottom': 20}),
@@ -285,7 +317,7 @@ class DashboardApp:
     
     def create_segment_purchase_chart(self):
         """세그먼트별 구매금액 차트 생성"""
-        segment_purchase = self.analyzer.customer_data.groupby('segment')['purchase_amount'].mean()
+        segment_purchase = self.analyzer.customer_data.groupby('segment', observed=True)['purchase_amount'].mean()
         fig = px.bar(x=segment_purchase.index, y=segment_purchase.values,
                     title="세그먼트별 평균 구매금액")
         fig.update_xaxis(title="세그먼트")
@@ -294,7 +326,7 @@ class DashboardApp:
     
     def create_segment_waiting_chart(self):
         """세그먼트별 대기시간 차트 생성"""
-        segment_waiting = self.analyzer.customer_data.groupby('segment')['waiting_time'].mean()
+        segment_waiting = self.analyzer.customer_data.groupby('segment', observed=True)['waiting_time'].mean()
         fig = px.bar(x=segment_waiting.index, y=segment_waiting.values,
                     title="세그먼트별 평균 대기시간")
         fig.update_xaxis(title="세그먼트")
@@ -10,57 +10,80 @@ Date: 2024
 
 import pandas as pd
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
-import json
+import re
 from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from utils import dump_report
+
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['axes.unicode_minus'] = False
 
+# 파일명에 쓸 수 없는 문자(와 공백)를 '_'로 바꾸기 위한 정규식 (모듈 로드 시 한 번만 컴파일)
+_FILENAME_UNSAFE_RE = re.compile(r'[<>:"/\\|?*\s]')
+
 class MarketResearchAnalyzer:
     """시장조사 데이터 분석 및 문제해결 클래스"""
     
     def __init__(self, brand_name: str = "스타벅스 강남점"):
         self.brand_name = brand_name
+        self.file_prefix = _FILENAME_UNSAFE_RE.sub('_', brand_name)
         self.customer_data = None
         self.sales_data = None
         self.competitor_data = None
         self.customer_segments = {}
+        self._analysis_cache = {}
         self.insights = {}
+        self.problems = None
+        self.strategies = None
+        self.execution_plan = None
+        self.kpis = None
         
-    def load_sample_data(self):
+    def load_sample_data(self, verbose: bool = True):
         """샘플 데이터 생성 및 로드"""
-        print(f"📊 {self.brand_name} 샘플 데이터 생성 중...")
+        if verbose:
+            print(f"📊 {self.brand_name} 샘플 데이터 생성 중...")
         
         # 고객 데이터 생성
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         n_customers = 1000
         
+        age = rng.normal(32, 8, n_customers).astype(np.int16)
+        # 범주형은 정수 인덱스를 샘플링한 뒤 from_codes로 감싸 문자열 객체 생성을 피함
+        gender_codes = rng.choice(2, n_customers)
+        visit_time_codes = rng.choice(4, n_customers, p=[0.4, 0.3, 0.2, 0.1])
+        purchase_amount = rng.normal(8500, 2000, n_customers).astype(np.float32)
+        visit_frequency_codes = rng.choice(3, n_customers, p=[0.3, 0.4, 0.3])
+        satisfaction = rng.normal(3.5, 0.8, n_customers).astype(np.float32)
+        waiting_time = rng.normal(12, 5, n_customers).astype(np.float32)
+        segment_codes = rng.choice(4, n_customers, p=[0.4, 0.3, 0.2, 0.1])
+        
+        # 수치형은 int16/float32, 범주형은 Categorical로 저장해 메모리와 집계 비용을 줄임
         self.customer_data = pd.DataFrame({
             'customer_id': range(1, n_customers + 1),
-            'age': np.random.normal(32, 8, n_customers).astype(int),
-            'gender': np.random.choice(['남성', '여성'], n_customers),
-            'visit_time': np.random.choice(['점심시간', '오후', '저녁', '주말'], n_customers, p=[0.4, 0.3, 0.2, 0.1]),
-            'purchase_amount': np.random.normal(8500, 2000, n_customers),
-            'visit_frequency': np.random.choice(['일주일 1-2회', '월 1-2회', '가끔'], n_customers, p=[0.3, 0.4, 0.3]),
-            'satisfaction': np.random.normal(3.5, 0.8, n_customers),
-            'waiting_time': np.random.normal(12, 5, n_customers),
-            'segment': np.random.choice(['점심시간커피러', '스터디이용자', '모임이용자', '일상커피러'], 
-                                      n_customers, p=[0.4, 0.3, 0.2, 0.1])
+            'age': age,
+            'gender': pd.Categorical.from_codes(gender_codes, categories=['남성', '여성']),
+            'visit_time': pd.Categorical.from_codes(visit_time_codes, categories=['점심시간', '오후', '저녁', '주말']),
+            'purchase_amount': purchase_amount,
+            'visit_frequency': pd.Categorical.from_codes(visit_frequency_codes, categories=['일주일 1-2회', '월 1-2회', '가끔']),
+            'satisfaction': satisfaction,
+            'waiting_time': waiting_time,
+            'segment': pd.Categorical.from_codes(segment_codes, categories=['점심시간커피러', '스터디이용자', '모임이용자', '일상커피러'])
         })
         
         # 매출 데이터 생성
         dates = pd.date_range(start='2024-01-01', end='2024-06-30', freq='D')
         self.sales_data = pd.DataFrame({
             'date': dates,
-            'daily_sales': np.random.normal(2500000, 500000, len(dates)),
-            'customer_count': np.random.normal(300, 50, len(dates)),
-            'avg_purchase': np.random.normal(8500, 1000, len(dates))
+            'daily_sales': rng.normal(2500000, 500000, len(dates)).astype(np.float32),
+            'customer_count': rng.normal(300, 50, len(dates)).astype(np.float32),
+            'avg_purchase': rng.normal(8500, 1000, len(dates)).astype(np.float32)
         })
         
         # 경쟁사 데이터 생성
@@ -71,53 +94,116 @@ class MarketResearchAnalyzer:
             'customer_satisfaction': [3.8, 4.1, 3.6, 3.9, 4.0]
         })
         
-        print("✅ 샘플 데이터 생성 완료!")
+        if verbose:
+            print("✅ 샘플 데이터 생성 완료!")
         
-    def analyze_customer_segments(self):
+    def analyze_customer_segments(self, verbose: bool = True):
         """고객 세그먼트 분석"""
-        print("\n🎯 고객 세그먼트 분석 시작...")
-        
-        segment_analysis = {}
+        if verbose:
+            print("\n🎯 고객 세그먼트 분석 시작...")
         
-        for segment in self.customer_data['segment'].unique():
-            segment_data = self.customer_data[self.customer_data['segment'] == segment]
-            
-            analysis = {
-                'count': len(segment_data),
-                'percentage': len(segment_data) / len(self.customer_data) * 100,
-                'avg_age': segment_data['age'].mean(),
-                'avg_purchase': segment_data['purchase_amount'].mean(),
-                'avg_satisfaction': segment_data['satisfaction'].mean(),
-                'avg_waiting_time': segment_data['waiting_time'].mean(),
-                'gender_distribution': segment_data['gender'].value_counts().to_dict(),
-                'visit_time_distribution': segment_data['visit_time'].value_counts().to_dict()
-            }
-            
-            segment_analysis[segment] = analysis
-            
+        segment_analysis = self._memoized('segments', self._compute_segments)
         self.customer_segments = segment_analysis
         
         # 결과 출력
-        print("\n📊 고객 세그먼트 분석 결과:")
-        for segment, data in segment_analysis.items():
-            print(f"\n🔸 {segment}:")
-            print(f"   - 고객 수: {data['count']}명 ({data['percentage']:.1f}%)")
-            print(f"   - 평균 연령: {data['avg_age']:.1f}세")
-            print(f"   - 평균 구매금액: {data['avg_purchase']:,.0f}원")
-            print(f"   - 평균 만족도: {data['avg_satisfaction']:.1f}/5.0")
-            print(f"   - 평균 대기시간: {data['avg_waiting_time']:.1f}분")
+        if verbose:
+            print("\n📊 고객 세그먼트 분석 결과:")
+            for segment, data in segment_analysis.items():
+                print(f"\n🔸 {segment}:")
+                print(f"   - 고객 수: {data['count']}명 ({data['percentage']:.1f}%)")
+                print(f"   - 평균 연령: {data['avg_age']:.1f}세")
+                print(f"   - 평균 구매금액: {data['avg_purchase']:,.0f}원")
+                print(f"   - 평균 만족도: {data['avg_satisfaction']:.1f}/5.0")
+                print(f"   - 평균 대기시간: {data['avg_waiting_time']:.1f}분")
+            
+        return segment_analysis
+    
+    def _memoized(self, key: str, compute):
+        """같은 customer_data 객체에 대한 분석 결과를 재사용 (데이터를 새로 할당하면 다시 계산, 제자리 수정은 감지하지 않음)"""
+        customer_data = self.customer_data
+        cached = self._analysis_cache.get(key)
+        if cached is not None and cached[0] is customer_data:
+            return cached[1]
+        
+        result = compute(customer_data)
+        self._analysis_cache[key] = (customer_data, result)
+        return result
+    
+    def _compute_segments(self, customer_data: pd.DataFrame) -> Dict:
+        """세그먼트별 통계 계산"""
+        total_customers = len(customer_data)
+        
+        # 세그먼트별 수치 통계를 한 번의 groupby로 계산 (세그먼트 등장 순서 유지)
+        segment_stats = customer_data.groupby('segment', sort=False, observed=True).agg(
+            count=('age', 'size'),
+            avg_age=('age', 'mean'),
+            avg_purchase=('purchase_amount', 'mean'),
+            avg_satisfaction=('satisfaction', 'mean'),
+            avg_waiting_time=('waiting_time', 'mean')
+        )
+        gender_counts = pd.crosstab(customer_data['segment'], customer_data['gender'])
+        visit_time_counts = pd.crosstab(customer_data['segment'], customer_data['visit_time'])
+        
+        segment_analysis = {}
+        
+        for segment, stats in segment_stats.to_dict(orient='index').items():
+            segment_analysis[segment] = {
+                'count': stats['count'],
+                'percentage': stats['count'] / total_customers * 100,
+                'avg_age': stats['avg_age'],
+                'avg_purchase': stats['avg_purchase'],
+                'avg_satisfaction': stats['avg_satisfaction'],
+                'avg_waiting_time': stats['avg_waiting_time'],
+                'gender_distribution': self._count_distribution(gender_counts, segment),
+                'visit_time_distribution': self._count_distribution(visit_time_counts, segment)
+            }
             
         return segment_analysis
     
-    def identify_problems(self):
+    @staticmethod
+    def _count_distribution(crosstab: pd.DataFrame, segment) -> Dict:
+        """교차표의 세그먼트 행을 value_counts().to_dict()와 같은 형태(빈도 내림차순)로 변환"""
+        # 세그먼트의 값이 모두 결측이면 crosstab에 행이 없으므로 value_counts()처럼 빈 dict 반환
+        if segment not in crosstab.index:
+            return {}
+        counts = crosstab.loc[segment]
+        counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+        return counts.to_dict()
+    
+    def identify_problems(self, verbose: bool = True):
         """문제점 식별 및 분석"""
-        print("\n🚨 문제점 식별 및 분석...")
+        if verbose:
+            print("\n🚨 문제점 식별 및 분석...")
+        
+        problems = self._memoized('problems', self._compute_problems)
         
+        # 결과 출력
+        if verbose:
+            print("\n📋 식별된 주요 문제점:")
+            for problem, data in problems.items():
+                print(f"\n🔸 {problem}:")
+                print(f"   - 현재 상태: {data['current_state']}")
+                print(f"   - 목표 상태: {data['target_state']}")
+                print(f"   - 차이: {data['gap']}")
+                print(f"   - 영향도: {data['impact']}")
+                print(f"   - 영향받는 고객: {data['affected_customers']}명")
+                print(f"   - 매출 영향: {data['revenue_impact']:,.0f}원")
+            
+        self.problems = problems
+        return problems
+    
+    def _compute_problems(self, customer_data: pd.DataFrame) -> Dict:
+        """주요 문제점 지표 계산"""
         problems = {}
         
+        # 여러 문제에서 공통으로 쓰는 값은 한 번만 계산
+        total_customers = len(customer_data)
+        avg_purchase = float(customer_data['purchase_amount'].mean())
+        frequency_counts = customer_data['visit_frequency'].value_counts()
+        
         # 문제 1: 점심시간 대기시간 문제
-        lunch_segment = self.customer_data[self.customer_data['segment'] == '점심시간커피러']
-        avg_waiting_lunch = lunch_segment['waiting_time'].mean()
+        lunch_segment = customer_data[customer_data['segment'] == '점심시간커피러']
+        avg_waiting_lunch = float(lunch_segment['waiting_time'].mean())
         
         problems['점심시간_대기시간'] = {
             'current_state': f"{avg_waiting_lunch:.1f}분",
@@ -125,51 +211,41 @@ class MarketResearchAnalyzer:
             'gap': f"{avg_waiting_lunch - 10:.1f}분",
             'impact': '높음',
             'affected_customers': len(lunch_segment),
-            'revenue_impact': len(lunch_segment) * lunch_segment['purchase_amount'].mean() * 0.2  # 20% 매출 영향
+            'revenue_impact': len(lunch_segment) * float(lunch_segment['purchase_amount'].mean()) * 0.2  # 20% 매출 영향
         }
         
         # 문제 2: 재구매율 문제
-        frequent_customers = self.customer_data[self.customer_data['visit_frequency'] == '일주일 1-2회']
-        repurchase_rate = len(frequent_customers) / len(self.customer_data) * 100
+        frequent_count = int(frequency_counts.get('일주일 1-2회', 0))
+        repurchase_rate = frequent_count / total_customers * 100
         
         problems['재구매율'] = {
             'current_state': f"{repurchase_rate:.1f}%",
             'target_state': "70% 이상",
             'gap': f"{70 - repurchase_rate:.1f}%",
             'impact': '높음',
-            'affected_customers': len(self.customer_data) - len(frequent_customers),
-            'revenue_impact': (len(self.customer_data) - len(frequent_customers)) * self.customer_data['purchase_amount'].mean() * 0.3
+            'affected_customers': total_customers - frequent_count,
+            'revenue_impact': (total_customers - frequent_count) * avg_purchase * 0.3
         }
         
         # 문제 3: 신규 고객 유입 문제
-        new_customers = self.customer_data[self.customer_data['visit_frequency'] == '가끔']
-        new_customer_rate = len(new_customers) / len(self.customer_data) * 100
+        new_count = int(frequency_counts.get('가끔', 0))
+        new_customer_rate = new_count / total_customers * 100
         
         problems['신규고객_유입'] = {
             'current_state': f"{new_customer_rate:.1f}%",
             'target_state': "30% 이상",
             'gap': f"{30 - new_customer_rate:.1f}%",
             'impact': '중간',
-            'affected_customers': len(new_customers),
-            'revenue_impact': len(new_customers) * self.customer_data['purchase_amount'].mean() * 0.1
+            'affected_customers': new_count,
+            'revenue_impact': new_count * avg_purchase * 0.1
         }
         
-        # 결과 출력
-        print("\n📋 식별된 주요 문제점:")
-        for problem, data in problems.items():
-            print(f"\n🔸 {problem}:")
-            print(f"   - 현재 상태: {data['current_state']}")
-            print(f"   - 목표 상태: {data['target_state']}")
-            print(f"   - 차이: {data['gap']}")
-            print(f"   - 영향도: {data['impact']}")
-            print(f"   - 영향받는 고객: {data['affected_customers']}명")
-            print(f"   - 매출 영향: {data['revenue_impact']:,.0f}원")
-            
         return problems
     
-    def generate_insights(self):
+    def generate_insights(self, verbose: bool = True):
         """인사이트 도출"""
-        print("\n💡 인사이트 도출...")
+        if verbose:
+            print("\n💡 인사이트 도출...")
         
         insights = {}
         
@@ -202,20 +278,22 @@ class MarketResearchAnalyzer:
         self.insights = insights
         
         # 결과 출력
-        print("\n📊 도출된 인사이트:")
-        for category, data in insights.items():
-            print(f"\n🔸 {category}:")
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    print(f"   - {key}: {value}")
-            else:
-                print(f"   {data}")
+        if verbose:
+            print("\n📊 도출된 인사이트:")
+            for category, data in insights.items():
+                print(f"\n🔸 {category}:")
+                if isinstance(data, dict):
+                    for key, value in data.items():
+                        print(f"   - {key}: {value}")
+                else:
+                    print(f"   {data}")
                 
         return insights
     
-    def create_strategy(self):
+    def create_strategy(self, verbose: bool = True):
         """전략 수립"""
-        print("\n🎯 전략 수립...")
+        if verbose:
+            print("\n🎯 전략 수립...")
         
         strategies = {}
         
@@ -253,20 +331,23 @@ class MarketResearchAnalyzer:
         }
         
         # 결과 출력
-        print("\n📋 수립된 전략:")
-        for category, data in strategies.items():
-            print(f"\n🔸 {category}:")
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    print(f"   - {key}: {value}")
-            else:
-                print(f"   {data}")
+        if verbose:
+            print("\n📋 수립된 전략:")
+            for category, data in strategies.items():
+                print(f"\n🔸 {category}:")
+                if isinstance(data, dict):
+                    for key, value in data.items():
+                        print(f"   - {key}: {value}")
+                else:
+                    print(f"   {data}")
                 
+        self.strategies = strategies
         return strategies
     
-    def create_execution_plan(self):
+    def create_execution_plan(self, verbose: bool = True):
         """실행 계획 수립"""
-        print("\n🚀 실행 계획 수립...")
+        if verbose:
+            print("\n🚀 실행 계획 수립...")
         
         execution_plan = {
             'Phase_1_즉시실행': {
@@ -305,20 +386,23 @@ class MarketResearchAnalyzer:
         }
         
         # 결과 출력
-        print("\n📅 실행 계획:")
-        for phase, data in execution_plan.items():
-            print(f"\n🔸 {phase}:")
-            print(f"   - 기간: {data['기간']}")
-            print(f"   - 방안: {', '.join(data['방안'])}")
-            print(f"   - 예상 효과: {data['예상_효과']}")
-            print(f"   - 투자 비용: {data['투자비용']}")
-            print(f"   - ROI: {data['ROI']}")
+        if verbose:
+            print("\n📅 실행 계획:")
+            for phase, data in execution_plan.items():
+                print(f"\n🔸 {phase}:")
+                print(f"   - 기간: {data['기간']}")
+                print(f"   - 방안: {', '.join(data['방안'])}")
+                print(f"   - 예상 효과: {data['예상_효과']}")
+                print(f"   - 투자 비용: {data['투자비용']}")
+                print(f"   - ROI: {data['ROI']}")
             
+        self.execution_plan = execution_plan
         return execution_plan
     
-    def set_kpis(self):
+    def set_kpis(self, verbose: bool = True):
         """KPI 설정"""
-        print("\n📊 KPI 설정...")
+        if verbose:
+            print("\n📊 KPI 설정...")
         
         kpis = {
             'Phase_1_KPI': {
@@ -342,18 +426,30 @@ class MarketResearchAnalyzer:
         }
         
         # 결과 출력
-        print("\n🎯 설정된 KPI:")
-        for phase, data in kpis.items():
-            print(f"\n🔸 {phase}:")
-            for kpi, target in data.items():
-                print(f"   - {kpi}: {target}")
+        if verbose:
+            print("\n🎯 설정된 KPI:")
+            for phase, data in kpis.items():
+                print(f"\n🔸 {phase}:")
+                for kpi, target in data.items():
+                    print(f"   - {kpi}: {target}")
                 
+        self.kpis = kpis
         return kpis
     
     def generate_report(self):
         """종합 보고서 생성"""
         print("\n📋 종합 보고서 생성...")
         
+        # run_complete_analysis에서 이미 계산한 결과를 재사용하고, 없을 때만 조용히 계산
+        if self.problems is None:
+            self.identify_problems(verbose=False)
+        if self.strategies is None:
+            self.create_strategy(verbose=False)
+        if self.execution_plan is None:
+            self.create_execution_plan(verbose=False)
+        if self.kpis is None:
+            self.set_kpis(verbose=False)
+        
         report = {
             '프로젝트_개요': {
                 '브랜드명': self.brand_name,
@@ -362,69 +458,92 @@ class MarketResearchAnalyzer:
                 '주요목표': '고객 중심 비즈니스 문제 해결'
             },
             '고객_세그먼트_분석': self.customer_segments,
-            '식별된_문제점': self.identify_problems(),
+            '식별된_문제점': self.problems,
             '도출된_인사이트': self.insights,
-            '수립된_전략': self.create_strategy(),
-            '실행계획': self.create_execution_plan(),
-            'KPI': self.set_kpis()
+            '수립된_전략': self.strategies,
+            '실행계획': self.execution_plan,
+            'KPI': self.kpis
         }
         
         # JSON 파일로 저장
-        with open(f'{self.brand_name.replace(" ", "_")}_분석보고서.json', 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
-            
-        print(f"\n✅ 종합 보고서가 '{self.brand_name.replace(' ', '_')}_분석보고서.json' 파일로 저장되었습니다!")
+        dump_report(report, f'{self.file_prefix}_분석보고서.json')
         
+        print(f"\n✅ 종합 보고서가 '{self.file_prefix}_분석보고서.json' 파일로 저장되었습니다!")
+
+        # 원본 표 데이터는 Parquet(컬럼형, zstd 압축)으로 별도 저장
+        self.save_data_parquet()
+
         return report
+
+    def save_data_parquet(self):
+        """고객/매출 데이터를 Parquet 파일로 저장"""
+        prefix = self.file_prefix
+        try:
+            self.customer_data.to_parquet(f'{prefix}_고객데이터.parquet', compression='zstd')
+            self.sales_data.to_parquet(f'{prefix}_매출데이터.parquet', compression='zstd')
+        except ImportError:
+            print("⚠️ pyarrow가 설치되어 있지 않아 Parquet 저장을 건너뜁니다.")
+            return
+
+        print(f"✅ 원본 데이터가 '{prefix}_고객데이터.parquet', '{prefix}_매출데이터.parquet' 파일로 저장되었습니다!")
     
     def create_visualizations(self):
         """시각화 생성"""
         print("\n📊 시각화 생성...")
         
-        # 스타일 설정
-        plt.style.use('seaborn-v0_8')
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        fig.suptitle(f'{self.brand_name} 시장조사 분석 결과', fontsize=16, fontweight='bold')
-        
-        # 1. 고객 세그먼트 분포
-        segment_counts = self.customer_data['segment'].value_counts()
-        axes[0, 0].pie(segment_counts.values, labels=segment_counts.index, autopct='%1.1f%%', startangle=90)
-        axes[0, 0].set_title('고객 세그먼트 분포')
-        
-        # 2. 세그먼트별 평균 구매금액
-        segment_purchase = self.customer_data.groupby('segment')['purchase_amount'].mean()
-        axes[0, 1].bar(segment_purchase.index, segment_purchase.values, color='skyblue')
-        axes[0, 1].set_title('세그먼트별 평균 구매금액')
-        axes[0, 1].set_ylabel('구매금액 (원)')
-        axes[0, 1].tick_params(axis='x', rotation=45)
-        
-        # 3. 세그먼트별 만족도
-        segment_satisfaction = self.customer_data.groupby('segment')['satisfaction'].mean()
-        axes[1, 0].bar(segment_satisfaction.index, segment_satisfaction.values, color='lightcoral')
-        axes[1, 0].set_title('세그먼트별 평균 만족도')
-        axes[1, 0].set_ylabel('만족도 (5점 척도)')
-        axes[1, 0].tick_params(axis='x', rotation=45)
-        
-        # 4. 세그먼트별 대기시간
-        segment_waiting = self.customer_data.groupby('segment')['waiting_time'].mean()
-        axes[1, 1].bar(segment_waiting.index, segment_waiting.values, color='lightgreen')
-        axes[1, 1].set_title('세그먼트별 평균 대기시간')
-        axes[1, 1].set_ylabel('대기시간 (분)')
-        axes[1, 1].tick_params(axis='x', rotation=45)
-        
-        plt.tight_layout()
-        plt.savefig(f'{self.brand_name.replace(" ", "_")}_분석결과.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        
-        print(f"✅ 시각화가 '{self.brand_name.replace(' ', '_')}_분석결과.png' 파일로 저장되었습니다!")
+        # 전역 스타일을 바꾸지 않도록 그래프를 그리는 동안만 스타일 적용
+        with plt.style.context('seaborn-v0_8'):
+            fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+            fig.suptitle(f'{self.brand_name} 시장조사 분석 결과', fontsize=16, fontweight='bold')
+        
+            # 세그먼트별 그래프 입력값을 한 번의 groupby로 미리 집계
+            segment_stats = self.customer_data.groupby('segment', observed=True).agg(
+                purchase=('purchase_amount', 'mean'),
+                satisfaction=('satisfaction', 'mean'),
+                waiting=('waiting_time', 'mean'),
+                count=('purchase_amount', 'size')
+            )
+        
+            # 1. 고객 세그먼트 분포
+            segment_counts = segment_stats['count'].sort_values(ascending=False)
+            axes[0, 0].pie(segment_counts.values, labels=segment_counts.index, autopct='%1.1f%%', startangle=90)
+            axes[0, 0].set_title('고객 세그먼트 분포')
+        
+            # 2. 세그먼트별 평균 구매금액
+            segment_purchase = segment_stats['purchase']
+            axes[0, 1].bar(segment_purchase.index, segment_purchase.values, color='skyblue')
+            axes[0, 1].set_title('세그먼트별 평균 구매금액')
+            axes[0, 1].set_ylabel('구매금액 (원)')
+            axes[0, 1].tick_params(axis='x', rotation=45)
+        
+            # 3. 세그먼트별 만족도
+            segment_satisfaction = segment_stats['satisfaction']
+            axes[1, 0].bar(segment_satisfaction.index, segment_satisfaction.values, color='lightcoral')
+            axes[1, 0].set_title('세그먼트별 평균 만족도')
+            axes[1, 0].set_ylabel('만족도 (5점 척도)')
+            axes[1, 0].tick_params(axis='x', rotation=45)
+        
+            # 4. 세그먼트별 대기시간
+            segment_waiting = segment_stats['waiting']
+            axes[1, 1].bar(segment_waiting.index, segment_waiting.values, color='lightgreen')
+            axes[1, 1].set_title('세그먼트별 평균 대기시간')
+            axes[1, 1].set_ylabel('대기시간 (분)')
+            axes[1, 1].tick_params(axis='x', rotation=45)
+        
+            plt.tight_layout()
+            plt.savefig(f'{self.file_prefix}_분석결과.png', dpi=300, bbox_inches='tight')
+        plt.close(fig)
+        
+        print(f"✅ 시각화가 '{self.file_prefix}_분석결과.png' 파일로 저장되었습니다!")
     
     def run_complete_analysis(self):
         """전체 분석 실행"""
         print(f"🚀 {self.brand_name} 시장조사 기반 문제해결 프로젝트 시작!")
         print("=" * 60)
         
-        # 1. 데이터 로드
-        self.load_sample_data()
+        # 1. 데이터 로드 (이미 로드된 데이터가 있으면 재사용)
+        if self.customer_data is None:
+            self.load_sample_data()
         
         # 2. 고객 세그먼트 분석
         self.analyze_customer_segments()
@@ -453,8 +572,8 @@ class MarketResearchAnalyzer:
         print("\n" + "=" * 60)
         print("🎉 시장조사 기반 문제해결 프로젝트 완료!")
         print("📁 생성된 파일:")
-        print(f"   - {self.brand_name.replace(' ', '_')}_분석보고서.json")
-        print(f"   - {self.brand_name.replace(' ', '_')}_분석결과.png")
+        print(f"   - {self.file_prefix}_분석보고서.json")
+        print(f"   - {self.file_prefix}_분석결과.png")
 
 
 def main():
@@ -467,4 +586,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 명령줄 실행에서는 그래프를 파일로만 저장하므로 비대화형 백엔드 사용 (GUI 초기화 비용 없음)
+    matplotlib.use('Agg')
     main()
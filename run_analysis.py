@@ -11,21 +11,80 @@ Date: 2024
 import os
 import sys
 import argparse
+import hashlib
+from importlib.util import find_spec
 from datetime import datetime
+import numpy as np
+import matplotlib
+import pandas as pd
 from market_research_analyzer import MarketResearchAnalyzer
+from utils import write_csv
 
-def check_requirements():
-    """필요한 패키지 설치 확인"""
+# CSV 로드 시 타입 추론을 건너뛰도록 컬럼 타입을 미리 지정
+# (ID는 'CUST_1' 같은 문자열일 수 있고, 나이는 빈 칸·소수도 허용하도록 float32로 읽음)
+CUSTOMER_DTYPES = {
+    'customer_id': 'string',
+    'age': 'float32',
+    'gender': 'category',
+    'visit_time': 'category',
+    'purchase_amount': 'float32',
+    'visit_frequency': 'category',
+    'satisfaction': 'float32',
+    'waiting_time': 'float32',
+    'segment': 'category'
+}
+# 읽은 뒤 모든 값이 결측 없는 정수일 때만 축소하는 컬럼
+INTEGRAL_DTYPES = {'age': 'int16'}
+SALES_DTYPES = {
+    'daily_sales': 'float32',
+    'customer_count': 'float32',
+    'avg_purchase': 'float32'
+}
+
+# 이 크기를 넘는 CSV는 청크 단위로 나눠 읽음
+LARGE_CSV_BYTES = 100 * 1024 * 1024
+
+# 패키지 확인 결과를 requirements.txt·인터프리터 해시와 함께 기록해 두는 파일
+REQUIREMENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'requirements.txt')
+REQUIREMENTS_SENTINEL = os.path.join(os.path.expanduser('~'), '.cache', 'eatlytics', 'requirements_ok')
+
+def _requirements_digest():
+    """requirements.txt와 현재 인터프리터(경로·환경·버전)의 SHA-256 해시 (파일이 없으면 None)"""
+    try:
+        with open(REQUIREMENTS_FILE, 'rb') as f:
+            requirements = f.read()
+    except OSError:
+        return None
+    
+    # 다른 venv나 인터프리터에서는 설치된 패키지가 다르므로 해시에 함께 포함
+    digest = hashlib.sha256(requirements)
+    for value in (sys.executable, sys.prefix, sys.version):
+        digest.update(b'\0' + value.encode('utf-8'))
+    return digest.hexdigest()
+
+def check_requirements(force=False):
+    """필요한 패키지 설치 확인 (같은 인터프리터와 requirements.txt로 이미 확인했다면 생략)"""
+    digest = _requirements_digest()
+    if not force and digest:
+        try:
+            with open(REQUIREMENTS_SENTINEL, encoding='utf-8') as f:
+                if f.read().strip() == digest:
+                    return True
+        except OSError:
+            pass
+    
     required_packages = [
         'pandas', 'numpy', 'matplotlib', 'seaborn', 
         'plotly', 'dash', 'scikit-learn'
     ]
     
+    # pip 패키지명과 import 모듈명이 다른 경우
+    module_names = {'scikit-learn': 'sklearn'}
+    
+    # 모듈을 실제로 import하지 않고 설치 여부만 확인
     missing_packages = []
     for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
+        if find_spec(module_names.get(package, package)) is None:
             missing_packages.append(package)
     
     if missing_packages:
@@ -37,6 +96,15 @@ def check_requirements():
         return False
     
     print("✅ 모든 필요한 패키지가 설치되어 있습니다.")
+    
+    # 확인 결과 기록 (기록에 실패해도 다음 실행에서 다시 확인할 뿐이므로 무시)
+    if digest:
+        try:
+            os.makedirs(os.path.dirname(REQUIREMENTS_SENTINEL), exist_ok=True)
+            with open(REQUIREMENTS_SENTINEL, 'w', encoding='utf-8') as f:
+                f.write(digest)
+        except OSError:
+            pass
     return True
 
 def create_sample_data():
@@ -44,43 +112,93 @@ def create_sample_data():
     print("📊 샘플 데이터 파일 생성 중...")
     
     # 고객 데이터 생성
-    import pandas as pd
-    import numpy as np
-    
-    np.random.seed(42)
+    # SFC64 비트 생성기: 대량 추출에서 기본 PCG64보다 빠름 (시드 고정으로 재현 가능)
+    rng = np.random.default_rng(np.random.SFC64(42))
     n_customers = 1000
     
+    # 수치 컬럼(연령, 구매금액, 만족도, 대기시간)은 한 번의 표준정규 행렬에서 컬럼별로 스케일링
+    numeric = rng.standard_normal((n_customers, 4))
+    numeric *= np.array([8, 2000, 0.8, 5])
+    numeric += np.array([32, 8500, 3.5, 12])
+    
+    # 범주형은 int8 코드를 샘플링한 뒤 Categorical로 감쌈
+    def categorical(categories, p=None):
+        codes = rng.choice(len(categories), n_customers, p=p).astype(np.int8)
+        return pd.Categorical.from_codes(codes, categories=categories)
+    
     customer_data = pd.DataFrame({
-        'customer_id': range(1, n_customers + 1),
-        'age': np.random.normal(32, 8, n_customers).astype(int),
-        'gender': np.random.choice(['남성', '여성'], n_customers),
-        'visit_time': np.random.choice(['점심시간', '오후', '저녁', '주말'], n_customers, p=[0.4, 0.3, 0.2, 0.1]),
-        'purchase_amount': np.random.normal(8500, 2000, n_customers),
-        'visit_frequency': np.random.choice(['일주일 1-2회', '월 1-2회', '가끔'], n_customers, p=[0.3, 0.4, 0.3]),
-        'satisfaction': np.random.normal(3.5, 0.8, n_customers),
-        'waiting_time': np.random.normal(12, 5, n_customers),
-        'segment': np.random.choice(['점심시간커피러', '스터디이용자', '모임이용자', '일상커피러'], 
-                                  n_customers, p=[0.4, 0.3, 0.2, 0.1])
+        'customer_id': np.arange(1, n_customers + 1, dtype=np.int32),
+        'age': numeric[:, 0].astype(np.int16),
+        'gender': categorical(['남성', '여성']),
+        'visit_time': categorical(['점심시간', '오후', '저녁', '주말'], p=[0.4, 0.3, 0.2, 0.1]),
+        'purchase_amount': numeric[:, 1].astype(np.float32),
+        'visit_frequency': categorical(['일주일 1-2회', '월 1-2회', '가끔'], p=[0.3, 0.4, 0.3]),
+        'satisfaction': numeric[:, 2].astype(np.float32),
+        'waiting_time': numeric[:, 3].astype(np.float32),
+        'segment': categorical(['점심시간커피러', '스터디이용자', '모임이용자', '일상커피러'],
+                               p=[0.4, 0.3, 0.2, 0.1])
     })
     
     # 매출 데이터 생성
     dates = pd.date_range(start='2024-01-01', end='2024-06-30', freq='D')
+    
+    # 매출 수치 3개 컬럼도 한 번의 float32 표준정규 행렬에서 컬럼별로 스케일링
+    sales = rng.standard_normal((len(dates), 3), dtype=np.float32)
     sales_data = pd.DataFrame({
         'date': dates,
-        'daily_sales': np.random.normal(2500000, 500000, len(dates)),
-        'customer_count': np.random.normal(300, 50, len(dates)),
-        'avg_purchase': np.random.normal(8500, 1000, len(dates))
+        'daily_sales': sales[:, 0] * 500_000 + 2_500_000,
+        'customer_count': (sales[:, 1] * 50 + 300).astype(np.int16),
+        'avg_purchase': sales[:, 2] * 1000 + 8500
     })
     
     # 파일 저장
-    customer_data.to_csv('sample_customer_data.csv', index=False, encoding='utf-8-sig')
-    sales_data.to_csv('sample_sales_data.csv', index=False, encoding='utf-8-sig')
+    write_csv(customer_data, 'sample_customer_data.csv')
+    write_csv(sales_data, 'sample_sales_data.csv')
     
     print("✅ 샘플 데이터 파일 생성 완료:")
     print("   - sample_customer_data.csv")
     print("   - sample_sales_data.csv")
 
-def run_analysis(brand_name, use_real_data=False, customer_file=None, sales_file=None):
+def _read_csv(path, dtype, parse_dates=None, chunksize=500_000):
+    """CSV 로드 (큰 파일은 청크 단위, 그 외에는 pyarrow 멀티스레드 파서 우선, 없으면 C 파서)"""
+    if os.path.getsize(path) > LARGE_CSV_BYTES:
+        data = _read_large_csv(path, dtype, parse_dates=parse_dates, chunksize=chunksize)
+    else:
+        try:
+            data = pd.read_csv(path, engine='pyarrow', dtype=dtype, parse_dates=parse_dates)
+        except ImportError:
+            data = pd.read_csv(path, engine='c', dtype=dtype, parse_dates=parse_dates,
+                               low_memory=False, cache_dates=True)
+    return _downcast_integral(data)
+
+def _downcast_integral(data):
+    """INTEGRAL_DTYPES 컬럼을 결측·소수가 없고 범위 안일 때만 정수로 축소 (아니면 float 그대로 유지)"""
+    casts = {}
+    for column, integer_dtype in INTEGRAL_DTYPES.items():
+        if column not in data.columns:
+            continue
+        values = data[column].to_numpy()
+        limits = np.iinfo(integer_dtype)
+        if (np.isfinite(values).all() and (values == np.round(values)).all()
+                and values.min(initial=0) >= limits.min and values.max(initial=0) <= limits.max):
+            casts[column] = integer_dtype
+    return data.astype(casts) if casts else data
+
+def _read_large_csv(path, dtype, parse_dates=None, chunksize=500_000):
+    """큰 CSV를 청크 단위로 읽어 필요한 컬럼만 모음 (최대 메모리 사용량 제한)"""
+    needed_columns = set(dtype) | set(parse_dates or [])
+    chunks = pd.read_csv(path, engine='c', dtype=dtype, parse_dates=parse_dates,
+                         usecols=lambda column: column in needed_columns,
+                         chunksize=chunksize, cache_dates=True)
+    data = pd.concat(list(chunks), ignore_index=True, copy=False)
+    
+    # 청크마다 범주가 달라 object로 풀린 범주형 컬럼은 다시 category로 변환
+    category_columns = [column for column, column_dtype in dtype.items()
+                        if column_dtype == 'category' and column in data.columns]
+    return data.astype({column: 'category' for column in category_columns})
+
+def run_analysis(brand_name, use_real_data=False, customer_file=None, sales_file=None,
+                 chunksize=500_000):
     """분석 실행"""
     print(f"🚀 {brand_name} 시장조사 분석 시작!")
     print("=" * 60)
@@ -92,9 +210,9 @@ def run_analysis(brand_name, use_real_data=False, customer_file=None, sales_file
     if use_real_data and customer_file and sales_file:
         print("📁 실제 데이터 로드 중...")
         try:
-            analyzer.customer_data = pd.read_csv(customer_file)
-            analyzer.sales_data = pd.read_csv(sales_file)
-            analyzer.sales_data['date'] = pd.to_datetime(analyzer.sales_data['date'])
+            analyzer.customer_data = _read_csv(customer_file, CUSTOMER_DTYPES, chunksize=chunksize)
+            analyzer.sales_data = _read_csv(sales_file, SALES_DTYPES, parse_dates=['date'],
+                                            chunksize=chunksize)
             print("✅ 실제 데이터 로드 완료!")
         except Exception as e:
             print(f"❌ 데이터 로드 오류: {e}")
@@ -141,8 +259,8 @@ def run_analysis(brand_name, use_real_data=False, customer_file=None, sales_file
         print("\n" + "=" * 60)
         print("🎉 분석 완료!")
         print("📁 생성된 파일:")
-        print(f"   - {brand_name.replace(' ', '_')}_분석보고서.json")
-        print(f"   - {brand_name.replace(' ', '_')}_분석결과.png")
+        print(f"   - {analyzer.file_prefix}_분석보고서.json")
+        print(f"   - {analyzer.file_prefix}_분석결과.png")
         
         return True
         
@@ -179,6 +297,10 @@ def main():
                        help='고객 데이터 CSV 파일 경로')
     parser.add_argument('--sales-file', '-s', 
                        help='매출 데이터 CSV 파일 경로')
+    parser.add_argument('--chunksize', type=int, default=500_000, 
+                       help='100MB 이상 CSV를 나눠 읽을 때의 청크 행 수 (기본값: 500000)')
+    parser.add_argument('--force-check', action='store_true', 
+                       help='이전 확인 결과와 관계없이 패키지 설치 여부를 다시 확인')
     parser.add_argument('--create-sample', action='store_true', 
                        help='샘플 데이터 파일 생성')
     
@@ -188,7 +310,7 @@ def main():
     print("=" * 60)
     
     # 필요한 패키지 확인
-    if not check_requirements():
+    if not check_requirements(force=args.force_check):
         return
     
     # 샘플 데이터 생성
@@ -202,7 +324,8 @@ def main():
             brand_name=args.brand,
             use_real_data=args.real_data,
             customer_file=args.customer_file,
-            sales_file=args.sales_file
+            sales_file=args.sales_file,
+            chunksize=args.chunksize
         )
         
         if not success:
@@ -221,4 +344,6 @@ def main():
         run_dashboard(args.port)
 
 if __name__ == "__main__":
+    # 명령줄 실행에서는 그래프를 파일로만 저장하므로 비대화형 백엔드 사용 (GUI 초기화 비용 없음)
+    matplotlib.use('Agg')
     main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공통 유틸리티
+Shared Utilities
+
+Author: AI Assistant
+Date: 2024
+"""
+
+import csv
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 저장
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow가 없으면 pandas to_csv로 저장
+    pa = None
+
+# Excel에서 한글이 깨지지 않도록 CSV 앞에 붙이는 UTF-8 BOM (utf-8-sig와 동일)
+UTF8_BOM = b'\xef\xbb\xbf'
+
+
+def _json_default(obj):
+    """표준 json이 처리하지 못하는 NumPy 값을 파이썬 기본 타입으로 변환"""
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    return str(obj)
+
+
+def dump_report(obj, path):
+    """보고서(dict)를 JSON 파일로 저장 (orjson 우선, 없으면 표준 json)"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, default=_json_default, option=option))
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2, default=_json_default)
+
+
+def _is_string_values(values):
+    """결측을 뺀 값이 모두 문자열인지 확인"""
+    return pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')
+
+
+def _arrow_csv_compatible(df):
+    """pyarrow writer가 to_csv와 같은 텍스트를 쓰는 컬럼 구성인지 확인
+
+    bool·timedelta·시간대 있는 시각·초 미만 시각·nullable 확장 숫자형은 표기가 달라지므로 제외.
+    컬럼이 하나뿐이면 빈 값 행을 to_csv가 ""로 쓰므로 역시 제외.
+    """
+    if len(df.columns) < 2:
+        return False
+
+    for column in df.columns:
+        values = df[column]
+        dtype = values.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            if not _is_string_values(dtype.categories):
+                return False
+        elif isinstance(dtype, pd.StringDtype) or dtype == object:
+            if not _is_string_values(values):
+                return False
+        elif isinstance(dtype, np.dtype) and dtype.kind in 'iuf':
+            continue
+        elif isinstance(dtype, np.dtype) and dtype.kind == 'M':
+            if not values.dt.floor('s').equals(values):
+                return False
+        else:
+            return False
+    return True
+
+
+def _to_arrow_table(df):
+    """DataFrame을 Arrow 테이블로 변환 (시각 없는 날짜는 date32, 초 단위 시각은 timestamp[s]로 to_csv와 같게 표기)"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for column in df.columns:
+        values = df[column]
+        if not (isinstance(values.dtype, np.dtype) and values.dtype.kind == 'M'):
+            continue
+        target = pa.date32() if values.dt.normalize().equals(values) else pa.timestamp('s')
+        index = table.schema.get_field_index(column)
+        table = table.set_column(index, column, table.column(index).cast(target))
+    return table
+
+
+def write_csv(df, path):
+    """DataFrame을 UTF-8 BOM CSV로 저장 (pyarrow 멀티스레드 컬럼 단위 writer 우선, 없으면 to_csv)
+
+    pyarrow로 쓸 수 있는 컬럼 구성(_arrow_csv_compatible)이면 to_csv와 같은 텍스트를 쓰되,
+    지수 표기가 필요한 실수만 표기가 다를 수 있음 (예: 1e-07 → 1e-7, float32 2.0692205e+06 → 2069220.5; 값은 동일).
+    그 밖의 컬럼 구성은 to_csv로 저장.
+    """
+    if pa is not None and _arrow_csv_compatible(df):
+        # pyarrow는 문자열을 모두 따옴표로 감싸므로 따옴표 없이 쓰고, 헤더는 csv 모듈로 최소한만 감쌈
+        header = io.StringIO()
+        csv.writer(header, lineterminator='\n').writerow(df.columns)
+        options = pacsv.WriteOptions(include_header=False, quoting_style='none')
+        try:
+            with open(path, 'wb') as f:
+                f.write(UTF8_BOM + header.getvalue().encode('utf-8'))
+                pacsv.write_csv(_to_arrow_table(df), f, write_options=options)
+            return
+        except pa.ArrowInvalid:
+            pass  # 쉼표·따옴표·줄바꿈이 든 값은 따옴표가 필요하므로 to_csv로 다시 저장
+
+    df.to_csv(path, index=False, encoding='utf-8-sig')
@@ -8,17 +8,98 @@ Author: AI Assistant
 Date: 2024
 """
 
+from functools import lru_cache
 import pandas as pd
 import numpy as np
+import matplotlib
 from market_research_analyzer import MarketResearchAnalyzer
+from utils import write_csv
 
-def example_1_basic_analysis():
-    """예시 1: 기본 분석 실행"""
+@lru_cache(maxsize=1)
+def _sample_dataset():
+    """브랜드와 무관한 샘플 데이터를 한 번만 생성 (고객, 매출, 경쟁사)"""
+    analyzer = MarketResearchAnalyzer()
+    analyzer.load_sample_data(verbose=False)
+    return analyzer.customer_data, analyzer.sales_data, analyzer.competitor_data
+
+def _brand_summary(block):
+    """(N, 3) 지표 블록에서 고객 수와 지표별 평균을 한 번의 float64 합 리덕션으로 계산"""
+    n = block.shape[0]
+    return n, block.sum(axis=0, dtype=np.float64) / n
+
+def _analyze_one(brand):
+    """브랜드 하나의 핵심 지표 분석"""
+    analyzer = MarketResearchAnalyzer(brand)
+    # 분석은 데이터를 수정하지 않으므로 얕은 복사로 캐시된 샘플 데이터를 공유
+    analyzer.customer_data, analyzer.sales_data, analyzer.competitor_data = (
+        df.copy(deep=False) for df in _sample_dataset()
+    )
+    
+    # 핵심 지표만 추출
+    segments = analyzer.analyze_customer_segments()
+    problems = analyzer.identify_problems()
+    
+    # 세 평균을 연속된 수치 블록 하나에 대한 리덕션으로 계산
+    n, means = _brand_summary(
+        analyzer.customer_data[['satisfaction', 'purchase_amount', 'waiting_time']].to_numpy()
+    )
+    
+    return brand, {
+        'total_customers': n,
+        'avg_satisfaction': means[0],
+        'avg_purchase': means[1],
+        'avg_waiting': means[2],
+        'main_problems': list(problems.keys())
+    }
+
+def _analyze_brands(brands):
+    """브랜드별 분석을 순서대로 실행 (브랜드당 수십 ms라 프로세스 풀 기동 비용이 더 큼)"""
+    return dict(_analyze_one(brand) for brand in brands)
+
+# 고객 데이터 수치 컬럼의 축소 dtype (load_sample_data가 만드는 dtype과 동일)
+DOWNCAST_DTYPES = {'age': 'int16', 'purchase_amount': 'float32',
+                   'satisfaction': 'float32', 'waiting_time': 'float32'}
+
+def _downcast(analyzer):
+    """외부에서 읽은 고객 데이터의 수치 컬럼을 int16/float32로 축소 (집계·내보내기 메모리 절반)"""
+    data = analyzer.customer_data
+    casts = {}
+    for column, dtype in DOWNCAST_DTYPES.items():
+        if column in data.columns:
+            # 결측이 있는 정수 컬럼은 NaN을 담을 수 있는 float32로 축소
+            casts[column] = 'float32' if dtype == 'int16' and data[column].hasnans else dtype
+    analyzer.customer_data = data.astype(casts)
+
+# 예시 5 커스텀 분석에서 그룹별 평균을 내는 지표 컬럼
+METRIC_COLUMNS = ['purchase_amount', 'satisfaction', 'waiting_time']
+
+def _group_means(customer_data, codes, labels, name):
+    """정수 그룹 코드별 지표 평균을 (지표 수, N) 배열 한 번의 bincount 패스로 계산"""
+    values = np.ascontiguousarray(customer_data[METRIC_COLUMNS].to_numpy(dtype=np.float64).T)
+    valid = codes >= 0  # 결측 키(-1)는 groupby와 같이 제외
+    codes, values = codes[valid], values[:, valid]
+    
+    n_groups = len(labels)
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.stack([np.bincount(codes, weights=row, minlength=n_groups) for row in values])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    
+    return pd.DataFrame(means.T, index=pd.Index(labels, name=name), columns=METRIC_COLUMNS).round(2)
+
+def _category_codes(column):
+    """범주형 컬럼의 정수 코드와 범주 목록 (범주형이 아니면 category로 변환해 계산, 원본은 수정하지 않음)"""
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype('category')
+    return column.cat.codes.to_numpy(), column.cat.categories
+
+def example_1_basic_analysis(analyzer=None):
+    """예시 1: 기본 분석 실행 (analyzer를 넘기면 이미 로드된 데이터를 재사용)"""
     print("🔸 예시 1: 기본 분석 실행")
     print("-" * 40)
     
     # 분석기 생성
-    analyzer = MarketResearchAnalyzer("스타벅스 강남점")
+    analyzer = analyzer or MarketResearchAnalyzer("스타벅스 강남점")
     
     # 전체 분석 실행
     analyzer.run_complete_analysis()
@@ -33,24 +114,21 @@ def example_2_custom_brand():
     # 다른 브랜드로 분석
     brands = ["메가커피 강남점", "투썸플레이스 강남점", "이디야 강남점"]
     
-    for brand in brands:
-        print(f"\n📊 {brand} 분석 중...")
-        analyzer = MarketResearchAnalyzer(brand)
-        analyzer.load_sample_data()
-        analyzer.analyze_customer_segments()
-        analyzer.identify_problems()
+    print(f"\n📊 {', '.join(brands)} 분석 중...")
+    for brand in _analyze_brands(brands):
         print(f"✅ {brand} 분석 완료!")
 
-def example_3_step_by_step():
-    """예시 3: 단계별 분석"""
+def example_3_step_by_step(analyzer=None):
+    """예시 3: 단계별 분석 (analyzer를 넘기면 이미 로드된 데이터를 재사용)"""
     print("\n🔸 예시 3: 단계별 분석")
     print("-" * 40)
     
-    analyzer = MarketResearchAnalyzer("스타벅스 강남점")
+    analyzer = analyzer or MarketResearchAnalyzer("스타벅스 강남점")
     
     # 1단계: 데이터 로드
     print("1단계: 데이터 로드")
-    analyzer.load_sample_data()
+    if analyzer.customer_data is None:
+        analyzer.load_sample_data()
     
     # 2단계: 고객 세그먼트 분석
     print("2단계: 고객 세그먼트 분석")
@@ -79,12 +157,19 @@ def example_4_real_data():
     def load_real_data(analyzer, customer_file, sales_file):
         """실제 데이터 로드"""
         try:
-            # 고객 데이터 로드
-            analyzer.customer_data = pd.read_csv(customer_file, encoding='utf-8-sig')
-            
-            # 매출 데이터 로드
-            analyzer.sales_data = pd.read_csv(sales_file, encoding='utf-8-sig')
-            analyzer.sales_data['date'] = pd.to_datetime(analyzer.sales_data['date'])
+            try:
+                # pyarrow 멀티스레드 파서로 로드 (날짜는 읽으면서 바로 timestamp로 변환)
+                analyzer.customer_data = pd.read_csv(customer_file, engine='pyarrow',
+                                                     dtype_backend='pyarrow')
+                analyzer.sales_data = pd.read_csv(sales_file, engine='pyarrow',
+                                                  dtype_backend='pyarrow', parse_dates=['date'])
+            except (ImportError, ValueError):
+                # pyarrow가 없거나 UTF-8이 아닌 파일은 C 파서로 로드
+                analyzer.customer_data = pd.read_csv(customer_file, encoding='utf-8-sig')
+                analyzer.sales_data = pd.read_csv(sales_file, encoding='utf-8-sig')
+                analyzer.sales_data['date'] = pd.to_datetime(analyzer.sales_data['date'],
+                                                             format='ISO8601', cache=True)
+            _downcast(analyzer)
             
             print("✅ 실제 데이터 로드 완료!")
             return True
@@ -110,59 +195,57 @@ def example_4_real_data():
         analyzer.load_sample_data()
         analyzer.run_complete_analysis()
 
-def example_5_custom_analysis():
-    """예시 5: 커스텀 분석"""
+def example_5_custom_analysis(analyzer=None):
+    """예시 5: 커스텀 분석 (analyzer를 넘기면 이미 로드된 데이터를 재사용)"""
     print("\n🔸 예시 5: 커스텀 분석")
     print("-" * 40)
     
-    analyzer = MarketResearchAnalyzer("커스텀 브랜드")
-    analyzer.load_sample_data()
+    analyzer = analyzer or MarketResearchAnalyzer("커스텀 브랜드")
+    if analyzer.customer_data is None:
+        analyzer.load_sample_data()
     
     # 커스텀 분석 1: 연령대별 분석
     print("연령대별 분석:")
-    age_groups = pd.cut(analyzer.customer_data['age'], 
-                       bins=[0, 25, 35, 45, 100], 
-                       labels=['20대', '30대', '40대', '50대+'])
-    age_analysis = analyzer.customer_data.groupby(age_groups).agg({
-        'purchase_amount': 'mean',
-        'satisfaction': 'mean',
-        'waiting_time': 'mean'
-    }).round(2)
+    # pd.cut(bins=[0, 25, 35, 45, 100])과 같은 구간(오른쪽 포함)을 np.digitize 정수 코드로 계산
+    # (pd.cut처럼 0 이하·100 초과·결측 나이는 어느 구간에도 넣지 않도록 코드 -1로 표시)
+    ages = analyzer.customer_data['age'].to_numpy(dtype=np.float32, na_value=np.nan)
+    in_range = (ages > 0) & (ages <= 100)
+    age_codes = np.where(in_range, np.digitize(ages, np.array([25, 35, 45], dtype=np.float32), right=True), -1)
+    age_analysis = _group_means(analyzer.customer_data, age_codes,
+                                ['20대', '30대', '40대', '50대+'], 'age')
     print(age_analysis)
     
     # 커스텀 분석 2: 성별 분석
     print("\n성별 분석:")
-    gender_analysis = analyzer.customer_data.groupby('gender').agg({
-        'purchase_amount': 'mean',
-        'satisfaction': 'mean',
-        'waiting_time': 'mean'
-    }).round(2)
+    gender_codes, genders = _category_codes(analyzer.customer_data['gender'])
+    gender_analysis = _group_means(analyzer.customer_data, gender_codes, genders, 'gender')
     print(gender_analysis)
     
     # 커스텀 분석 3: 방문시간대별 분석
     print("\n방문시간대별 분석:")
-    time_analysis = analyzer.customer_data.groupby('visit_time').agg({
-        'purchase_amount': 'mean',
-        'satisfaction': 'mean',
-        'waiting_time': 'mean'
-    }).round(2)
+    time_codes, visit_times = _category_codes(analyzer.customer_data['visit_time'])
+    time_analysis = _group_means(analyzer.customer_data, time_codes, visit_times, 'visit_time')
     print(time_analysis)
     
     print("✅ 커스텀 분석 완료!")
 
-def example_6_export_results():
-    """예시 6: 결과 내보내기"""
+def example_6_export_results(analyzer=None):
+    """예시 6: 결과 내보내기 (analyzer를 넘기면 이미 로드된 데이터를 재사용)"""
     print("\n🔸 예시 6: 결과 내보내기")
     print("-" * 40)
     
-    analyzer = MarketResearchAnalyzer("스타벅스 강남점")
-    analyzer.load_sample_data()
+    analyzer = analyzer or MarketResearchAnalyzer("스타벅스 강남점")
+    if analyzer.customer_data is None:
+        analyzer.load_sample_data()
     analyzer.analyze_customer_segments()
     problems = analyzer.identify_problems()
     insights = analyzer.generate_insights()
     
     # Excel 파일로 내보내기
-    with pd.ExcelWriter('분석결과.xlsx', engine='openpyxl') as writer:
+    # xlsxwriter는 openpyxl보다 쓰기가 빠름 (constant_memory는 pandas의 열 단위 쓰기와 맞지 않아 사용하지 않음)
+    # strings_to_urls를 끄면 문자열 셀마다 URL 패턴을 검사하지 않음
+    with pd.ExcelWriter('분석결과.xlsx', engine='xlsxwriter',
+                        engine_kwargs={'options': {'strings_to_urls': False}}) as writer:
         # 고객 데이터
         analyzer.customer_data.to_excel(writer, sheet_name='고객데이터', index=False)
         
@@ -180,12 +263,24 @@ def example_6_export_results():
     print("✅ Excel 파일로 내보내기 완료: 분석결과.xlsx")
     
     # CSV 파일로 내보내기
-    analyzer.customer_data.to_csv('고객데이터.csv', index=False, encoding='utf-8-sig')
-    analyzer.sales_data.to_csv('매출데이터.csv', index=False, encoding='utf-8-sig')
+    write_csv(analyzer.customer_data, '고객데이터.csv')
+    write_csv(analyzer.sales_data, '매출데이터.csv')
     
     print("✅ CSV 파일로 내보내기 완료:")
     print("   - 고객데이터.csv")
     print("   - 매출데이터.csv")
+    
+    # Parquet 파일로도 내보내기 (타입 보존, CSV보다 작고 빠름)
+    try:
+        analyzer.customer_data.to_parquet('고객데이터.parquet', compression='zstd')
+        analyzer.sales_data.to_parquet('매출데이터.parquet', compression='zstd')
+    except ImportError:
+        print("⚠️ pyarrow가 설치되어 있지 않아 Parquet 내보내기를 건너뜁니다.")
+        return
+    
+    print("✅ Parquet 파일로 내보내기 완료:")
+    print("   - 고객데이터.parquet")
+    print("   - 매출데이터.parquet")
 
 def example_7_batch_analysis():
     """예시 7: 배치 분석"""
@@ -194,29 +289,16 @@ def example_7_batch_analysis():
     
     # 여러 브랜드 배치 분석
     brands = ["스타벅스 강남점", "메가커피 강남점", "투썸플레이스 강남점"]
-    results = {}
     
-    for brand in brands:
-        print(f"\n📊 {brand} 분석 중...")
-        analyzer = MarketResearchAnalyzer(brand)
-        analyzer.load_sample_data()
-        
-        # 핵심 지표만 추출
-        segments = analyzer.analyze_customer_segments()
-        problems = analyzer.identify_problems()
-        
-        # 결과 저장
-        results[brand] = {
-            'total_customers': len(analyzer.customer_data),
-            'avg_satisfaction': analyzer.customer_data['satisfaction'].mean(),
-            'avg_purchase': analyzer.customer_data['purchase_amount'].mean(),
-            'avg_waiting': analyzer.customer_data['waiting_time'].mean(),
-            'main_problems': list(problems.keys())
-        }
+    print(f"\n📊 {', '.join(brands)} 분석 중...")
+    results = _analyze_brands(brands)
     
     # 배치 결과 요약
     print("\n📋 배치 분석 결과 요약:")
-    summary_df = pd.DataFrame(results).T
+    records = [{'brand': brand, **metrics} for brand, metrics in results.items()]
+    summary_df = pd.DataFrame.from_records(records, columns=[
+        'brand', 'total_customers', 'avg_satisfaction', 'avg_purchase', 'avg_waiting', 'main_problems'
+    ]).set_index('brand')
     print(summary_df.round(2))
     
     # 결과를 Excel로 저장
@@ -228,13 +310,17 @@ def main():
     print("🚀 시장조사 분석 실행 코드 예시")
     print("=" * 60)
     
+    # 같은 샘플 데이터를 쓰는 예시들은 분석기 하나를 공유 (데이터는 한 번만 생성)
+    shared = MarketResearchAnalyzer("스타벅스 강남점")
+    shared.load_sample_data()
+    
     # 예시 실행
-    example_1_basic_analysis()
+    example_1_basic_analysis(shared)
     example_2_custom_brand()
-    example_3_step_by_step()
+    example_3_step_by_step(shared)
     example_4_real_data()
-    example_5_custom_analysis()
-    example_6_export_results()
+    example_5_custom_analysis(shared)
+    example_6_export_results(shared)
     example_7_batch_analysis()
     
     print("\n" + "=" * 60)
@@ -249,4 +335,6 @@ def main():
     print("7. example_7_batch_analysis() - 배치 분석")
 
 if __name__ == "__main__":
+    # 명령줄 실행에서는 그래프를 파일로만 저장하므로 비대화형 백엔드 사용 (GUI 초기화 비용 없음)
+    matplotlib.use('Agg')
     main()